@@ -356,6 +356,7 @@ def _ensure_basic_methods(converter):
             try:
                 import os
                 import pandas as pd
+                import openpyxl
                 import tempfile
                 import fitz
                 
@@ -370,75 +371,78 @@ def _ensure_basic_methods(converter):
                 # 使用PyMuPDF打开PDF
                 pdf_document = fitz.open(self.pdf_path)
                 
-                # 创建一个Excel写入器
-                with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                    # 处理每一页
-                    for page_num in range(len(pdf_document)):
-                        # 提取表格 - 使用tabula或其他可用方法
-                        tables = []
-                        try:
-                            # 首先尝试使用tabula
-                            import tabula
-                            tables = tabula.read_pdf(
-                                self.pdf_path, 
-                                pages=page_num + 1,  # tabula使用1-based页码
-                                multiple_tables=True,
-                                guess=True,
-                                stream=method != "advanced",
-                                lattice=method == "advanced"
-                            )
-                            
-                            if not tables:
-                                # 如果tabula没有检测到表格，尝试使用PyMuPDF的表格检测
-                                if hasattr(self, '_extract_tables'):
-                                    tables_from_pymupdf = self._extract_tables(pdf_document, page_num)
-                                    # 将PyMuPDF格式转换为pandas DataFrame
-                                    if tables_from_pymupdf:
-                                        # 处理自定义表格格式...
-                                        pass
-                        except ImportError:
-                            # 如果tabula不可用，使用PyMuPDF提取文本并尝试解析表格
+                # 使用只写模式的工作簿，行数据直接流式写入文件，不在内存中保留整个工作表
+                workbook = openpyxl.Workbook(write_only=True)
+                
+                # 处理每一页
+                for page_num in range(len(pdf_document)):
+                    # 提取表格 - 使用tabula或其他可用方法
+                    tables = []
+                    try:
+                        # 首先尝试使用tabula
+                        import tabula
+                        tables = tabula.read_pdf(
+                            self.pdf_path, 
+                            pages=page_num + 1,  # tabula使用1-based页码
+                            multiple_tables=True,
+                            guess=True,
+                            stream=method != "advanced",
+                            lattice=method == "advanced"
+                        )
+                        
+                        if not tables:
+                            # 如果tabula没有检测到表格，尝试使用PyMuPDF的表格检测
                             if hasattr(self, '_extract_tables'):
                                 tables_from_pymupdf = self._extract_tables(pdf_document, page_num)
-                                # 处理自定义表格格式...
-                            else:
-                                # 回退到基本文本提取方法
-                                page = pdf_document[page_num]
-                                text = page.get_text("text")
-                                # 尝试使用文本构建基本表格
-                                # ... 基本表格解析逻辑 ...
-                        except Exception as e:
-                            print(f"提取表格错误 (页面 {page_num+1}): {e}")
-                        
-                        # 将表格写入Excel工作表
-                        if tables:
-                            for i, table in enumerate(tables):
-                                if isinstance(table, pd.DataFrame):
-                                    sheet_name = f"Page{page_num+1}_Table{i+1}"
-                                    if len(sheet_name) > 31:  # Excel工作表名称长度限制
-                                        sheet_name = sheet_name[:31]
-                                    table.to_excel(writer, sheet_name=sheet_name, index=False)
+                                # 将PyMuPDF格式转换为pandas DataFrame
+                                if tables_from_pymupdf:
+                                    # 处理自定义表格格式...
+                                    pass
+                    except ImportError:
+                        # 如果tabula不可用，使用PyMuPDF提取文本并尝试解析表格
+                        if hasattr(self, '_extract_tables'):
+                            tables_from_pymupdf = self._extract_tables(pdf_document, page_num)
+                            # 处理自定义表格格式...
                         else:
-                            # 如果没有检测到表格，创建一个空工作表
-                            sheet_name = f"Page{page_num+1}"
-                            if len(sheet_name) > 31:
-                                sheet_name = sheet_name[:31]
-                            pd.DataFrame().to_excel(writer, sheet_name=sheet_name)
-                            
-                            # 提取页面文本并添加到工作表
+                            # 回退到基本文本提取方法
                             page = pdf_document[page_num]
                             text = page.get_text("text")
-                            
-                            # 获取工作表
-                            worksheet = writer.sheets[sheet_name]
-                            
-                            # 按行分割文本并写入
-                            lines = text.split('\n')
-                            for row_idx, line in enumerate(lines):
-                                worksheet.cell(row=row_idx+1, column=1, value=line)
-                            
-                            # 调整列宽
-                            worksheet.column_dimensions['A'].width = 100
+                            # 尝试使用文本构建基本表格
+                            # ... 基本表格解析逻辑 ...
+                    except Exception as e:
+                        print(f"提取表格错误 (页面 {page_num+1}): {e}")
+                    
+                    # 将表格写入Excel工作表
+                    if tables:
+                        for i, table in enumerate(tables):
+                            if isinstance(table, pd.DataFrame):
+                                sheet_name = f"Page{page_num+1}_Table{i+1}"
+                                if len(sheet_name) > 31:  # Excel工作表名称长度限制
+                                    sheet_name = sheet_name[:31]
+                                worksheet = workbook.create_sheet(title=sheet_name)
+                                worksheet.append(list(table.columns))
+                                
+                                # 逐行写入，缺失值(NaN/NaT)写为空单元格
+                                values = table.astype(object).where(table.notna(), None)
+                                for row in values.itertuples(index=False, name=None):
+                                    worksheet.append(row)
+                    else:
+                        # 如果没有检测到表格，创建一个只包含页面文本的工作表
+                        sheet_name = f"Page{page_num+1}"
+                        if len(sheet_name) > 31:
+                            sheet_name = sheet_name[:31]
+                        worksheet = workbook.create_sheet(title=sheet_name)
+                        
+                        # 调整列宽 - 只写模式下必须在写入行之前设置
+                        worksheet.column_dimensions['A'].width = 100
+                        
+                        # 提取页面文本并按行写入
+                        page = pdf_document[page_num]
+                        text = page.get_text("text")
+                        for line in text.split('\n'):
+                            worksheet.append([line])
+                
+                workbook.save(output_path)
                 
                 # 关闭PDF
                 pdf_document.close()
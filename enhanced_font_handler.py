@@ -3,6 +3,10 @@
 """
 
 import re
+from collections import namedtuple
+
+# 单个span的字体信息，热路径中代替每个span新建的字典
+FontInfo = namedtuple("FontInfo", "font size color flags flags_extra weight")
 
 def map_font(pdf_font_name, quality="normal"):
     """
@@ -233,7 +237,7 @@ def detect_font_style(font_info):
     从字体信息中检测字体样式特征
     
     参数:
-        font_info: 字体信息字典
+        font_info: 字体信息字典或FontInfo命名元组
         
     返回:
         字体样式信息字典
@@ -247,10 +251,17 @@ def detect_font_style(font_info):
         "color": None  # 默认颜色
     }
     
+    # 同时支持字典和FontInfo(热路径中使用命名元组以减少字典创建)
+    if isinstance(font_info, dict):
+        get = font_info.get
+    else:
+        get = lambda key: getattr(font_info, key, None)
+    
+    font_name = get("font")
+    font_name = font_name.lower() if font_name else ""
+    
     # 检查字体名称中的样式提示
-    if "font" in font_info and font_info["font"]:
-        font_name = font_info["font"].lower()
-        
+    if font_name:
         # 检测粗体
         style["bold"] = any(x in font_name for x in ["bold", "heavy", "black", "strong", "粗", "黑", "dark", "demi"])
         
@@ -258,8 +269,8 @@ def detect_font_style(font_info):
         style["italic"] = any(x in font_name for x in ["italic", "oblique", "slant", "斜"])
     
     # 从字体标志或权重中检测粗体
-    if "flags" in font_info:
-        flags = font_info["flags"]
+    flags = get("flags")
+    if flags is not None:
         # 一些PDF库使用标志位表示字体样式
         # 通常第1位(0x1)表示固定宽度，第2位(0x2)表示衬线，
         # 第3位(0x4)表示象形文字，第4位(0x8)表示斜体，
@@ -269,58 +280,60 @@ def detect_font_style(font_info):
         if flags & 0x8:  # 检查斜体标志
             style["italic"] = True
     
-    if "weight" in font_info:
+    weight = get("weight")
+    if weight is not None:
         # 字体权重通常为100到900，700或以上通常被视为粗体
-        weight = font_info["weight"]
         if weight >= 700:
             style["bold"] = True
     
     # 获取字体大小
-    if "size" in font_info and font_info["size"]:
+    size = get("size")
+    if size:
         try:
-            size = float(font_info["size"])
+            size = float(size)
             if 1 <= size <= 144:  # 合理的字体大小范围
                 style["size"] = size
         except (ValueError, TypeError):
             pass
     
     # 获取字体颜色
-    if "color" in font_info and font_info["color"]:
-        style["color"] = font_info["color"]
+    color = get("color")
+    if color:
+        style["color"] = color
     
     # 检测装饰效果
-    if "rise" in font_info and font_info["rise"]:
+    rise = get("rise")
+    if rise:
         # 正值表示上标，负值表示下标
-        rise = font_info["rise"]
         if rise > 0:
             style["superscript"] = True
         elif rise < 0:
             style["subscript"] = True
     
     # 添加下划线和删除线检测
-    if "flags_extra" in font_info:
-        flags_extra = font_info["flags_extra"]
+    flags_extra = get("flags_extra")
+    if flags_extra is not None:
         if flags_extra & 0x1:  # 示例：检查下划线标志
             style["underline"] = True
         if flags_extra & 0x2:  # 示例：检查删除线标志
             style["strike"] = True
     
     # 检测特殊的文本装饰标记
-    if "font" in font_info and font_info["font"]:
-        font_name = font_info["font"].lower()
+    if font_name:
         if "underline" in font_name or "underlined" in font_name:
             style["underline"] = True
         if "strike" in font_name or "strikethrough" in font_name or "linethrough" in font_name:
             style["strike"] = True
     
     # 检测字距调整
-    if "char_spacing" in font_info and font_info["char_spacing"]:
-        style["char_spacing"] = font_info["char_spacing"]
+    char_spacing = get("char_spacing")
+    if char_spacing:
+        style["char_spacing"] = char_spacing
     
     # 检测小型大写字母
-    if "small_caps" in font_info and font_info["small_caps"]:
+    if get("small_caps"):
         style["small_caps"] = True
-    elif "font" in font_info and "smallcaps" in str(font_info["font"]).lower():
+    elif "smallcaps" in font_name:
         style["small_caps"] = True
     
     return style
@@ -10,15 +10,20 @@ import traceback
 
 # 导入必要的模块
 try:
-    from enhanced_font_handler import apply_font_style, detect_font_style, map_font
+    from enhanced_font_handler import FontInfo, apply_font_style, detect_font_style, map_font
     has_font_handler = True
 except ImportError:
     print("警告: 无法导入字体处理模块，将使用基本字体处理")
     has_font_handler = False
     
+    from collections import namedtuple
+    FontInfo = namedtuple("FontInfo", "font size color flags flags_extra weight")
+    
     # 创建基本的替代函数
     def detect_font_style(font_info):
         """基本字体样式检测"""
+        if isinstance(font_info, FontInfo):
+            font_info = font_info._asdict()
         style = {
             "bold": False,
             "italic": False,
@@ -177,6 +182,19 @@ def apply_enhanced_format_preservation(converter):
         
     # 增强字体处理
     if has_font_handler:
+        # 在打补丁时一次性确定原始方法和对齐检测是否可用，避免每次调用时重复查找
+        original_process = getattr(converter, '_process_text_block', None)
+        detect_alignment = getattr(converter, '_detect_text_alignment', None)
+        alignment_map = {}
+        if detect_alignment is not None:
+            from docx.enum.text import WD_ALIGN_PARAGRAPH
+            alignment_map = {
+                "center": WD_ALIGN_PARAGRAPH.CENTER,
+                "right": WD_ALIGN_PARAGRAPH.RIGHT,
+                "left": WD_ALIGN_PARAGRAPH.LEFT,
+                "justify": WD_ALIGN_PARAGRAPH.JUSTIFY
+            }
+        
         # 增强的文本块处理方法
         def enhanced_process_text_block(self, doc, block, text_spans=None):
             """
@@ -188,9 +206,6 @@ def apply_enhanced_format_preservation(converter):
                 text_spans: 可选的文本span列表
             """
             try:
-                # 获取原始方法
-                original_process = getattr(self, '_original_process_text_block', None)
-                
                 # 如果没有文本spans，使用block中的spans
                 if text_spans is None:
                     spans = []
@@ -209,23 +224,23 @@ def apply_enhanced_format_preservation(converter):
                 # 创建段落
                 p = doc.add_paragraph()
                 
-                # 处理段落对齐方式
-                if len(spans) > 0:
-                    # 获取第一个span的对齐信息
-                    first_span = spans[0]
-                    alignment = self._detect_text_alignment(first_span, block)
-                    
-                    # 设置段落对齐方式
-                    from docx.enum.text import WD_ALIGN_PARAGRAPH
-                    if alignment == "center":
-                        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    elif alignment == "right":
-                        p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    elif alignment == "left":
-                        p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    elif alignment == "justify":
-                        p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                
+                # 处理段落对齐方式(根据第一个span的对齐信息)
+                if alignment_map:
+                    alignment = detect_alignment(spans[0], block)
+                    if alignment in alignment_map:
+                        p.alignment = alignment_map[alignment]
+
+                # 所有span样式完全一致时(常见于标题、目录项)，合并为一个文本运行
+                style_keys = {(s.get("font"), s.get("size"), s.get("flags"), s.get("color")) for s in spans}
+                if len(spans) > 1 and len(style_keys) == 1:
+                    merged_span = dict(spans[0])
+                    merged_span["text"] = "".join(s.get("text", "") for s in spans)
+                    spans = [merged_span]
+
+                # 一个文本块中通常只有少数几种字体，每种字体只映射一次
+                mapped_fonts = {font: map_font(font, quality="high")
+                                for font in {span.get("font", "") for span in spans}}
+
                 # 处理每个span
                 for span in spans:
                     text = span.get("text", "").replace("\u0000", "")
@@ -235,19 +250,15 @@ def apply_enhanced_format_preservation(converter):
                         continue
                     
                     # 获取字体信息
-                    font_info = {
-                        "font": span.get("font", ""),
-                        "size": span.get("size", 11),
-                        "color": None,
-                        "flags": span.get("flags", 0),
-                        "flags_extra": span.get("flags_extra", 0),
-                        "weight": span.get("weight", 400)
-                    }
-                    
-                    # 处理颜色
-                    if "color" in span:
-                        pdf_color = span["color"]
-                        font_info["color"] = extract_color_info(pdf_color)
+                    color = extract_color_info(span["color"]) if "color" in span else None
+                    font_info = FontInfo(
+                        span.get("font", ""),
+                        span.get("size", 11),
+                        color,
+                        span.get("flags", 0),
+                        span.get("flags_extra", 0),
+                        span.get("weight", 400)
+                    )
                     
                     # 检测字体样式
                     font_style = detect_font_style(font_info)
@@ -257,7 +268,7 @@ def apply_enhanced_format_preservation(converter):
                     apply_font_style(run, font_style)
                     
                     # 设置字体名称
-                    font_name = map_font(font_info["font"], quality="high")
+                    font_name = mapped_fonts[font_info.font]
                     if font_name:
                         run.font.name = font_name
                     
@@ -273,8 +284,8 @@ def apply_enhanced_format_preservation(converter):
                         print(f"原始文本处理也失败: {orig_err}")
         
         # 备份原始方法
-        if hasattr(converter, '_process_text_block'):
-            converter._original_process_text_block = converter._process_text_block
+        if original_process is not None:
+            converter._original_process_text_block = original_process
         
         # 绑定增强方法
         converter._process_text_block = types.MethodType(enhanced_process_text_block, converter)
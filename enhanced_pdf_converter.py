@@ -12,11 +12,13 @@ import re
 import argparse
 import tempfile
 import shutil
+import hashlib
+import time
 import traceback
+import threading
+import multiprocessing
 import numpy as np
-import pandas as pd
 import cv2
-import matplotlib.pyplot as plt
 from docx import Document
 from docx.shared import Pt, Inches, Cm, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
@@ -27,32 +29,17 @@ from docx.oxml.shared import OxmlElement, qn
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
 from docx.table import _Cell, Table
+from docx.text.run import Run
 from docx.styles import styles
-from docxtpl import DocxTemplate
-# 修复tabula导入问题，确保在不同版本的tabula-py中都能正常工作
-import tabula
-# 确保read_pdf可用 - 这是为了解决'can't import name read_pdf from tabula'错误
-# 在一些tabula-py版本中，read_pdf应该从tabula.io导入
-try:
-    from tabula.io import read_pdf
-    tabula.read_pdf = read_pdf
-except (ImportError, AttributeError):
-    # 如果导入失败，但tabula已经导入成功，那么read_pdf可能已经是tabula的属性
-    if not hasattr(tabula, 'read_pdf'):
-        print("警告: 无法确定tabula.read_pdf的来源，可能影响表格提取功能")
-from PIL import Image, ImageOps, ImageEnhance, ImageCms, ImageCms
-import camelot
-import pdfplumber
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, Color, NamedStyle
-from openpyxl.utils import get_column_letter
-from openpyxl.drawing.image import Image as XLImage
-from openpyxl.chart import BarChart, Reference, LineChart
-from openpyxl.worksheet.table import Table as XLTable, TableStyleInfo
-import tkinter as tk
-from tkinter import filedialog, ttk, messagebox, simpledialog
+# pandas、matplotlib、camelot、tabula、openpyxl、tkinter等重量级模块在本模块中未使用，
+# 不在顶层导入以加快启动；需要它们的模块(如Excel导出、GUI)各自在使用处导入
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from zipfile import ZIP_DEFLATED
+from functools import lru_cache
+from itertools import groupby
+from copy import deepcopy
 
 # 尝试导入集成辅助模块
 try:
@@ -79,6 +66,554 @@ except ImportError:
         print("pip install PyMuPDF")
         sys.exit(1)
 
+# 内置字体映射表 (PDF字体名称小写关键字 -> Word字体)
+_FONT_MAP = {
+    # 基本字体
+    "times": "Times New Roman",
+    "times-roman": "Times New Roman",
+    "timesnewroman": "Times New Roman",
+    "timesnew": "Times New Roman",
+    "times new roman": "Times New Roman",
+    "roman": "Times New Roman",
+
+    # Arial/Helvetica 字体家族
+    "arial": "Arial",
+    "helvetica": "Arial",
+    "helv": "Arial",
+    "helveticaneue": "Arial",
+    "helvetica neue": "Arial",
+    "sans-serif": "Arial",
+    "sans serif": "Arial",
+
+    # Courier 字体家族
+    "courier": "Courier New",
+    "couriernew": "Courier New",
+    "courier new": "Courier New",
+    "cour": "Courier New",
+
+    "garamond": "Garamond",
+    "book antiqua": "Book Antiqua",
+    "bookman": "Bookman Old Style",
+    "palatino": "Palatino Linotype",
+    "century": "Century Schoolbook",
+    "candara": "Candara",
+    "consolas": "Consolas",
+    "constantia": "Constantia",
+    "corbel": "Corbel",
+    "franklin": "Franklin Gothic",
+    "gill": "Gill Sans",
+    "lucida": "Lucida Sans",
+
+    # 中文字体
+    "simsum": "SimSun",
+    "simsun": "SimSun",
+    "songti": "SimSun",
+    "sim sun": "SimSun",
+    "宋体": "SimSun",
+    "宋": "SimSun",
+
+    "simhei": "SimHei",
+    "heiti": "SimHei",
+    "sim hei": "SimHei",
+    "黑体": "SimHei",
+    "黑": "SimHei",
+
+    "kaiti": "KaiTi",
+    "kai": "KaiTi",
+    "楷体": "KaiTi",
+    "楷": "KaiTi",
+
+    "fangsong": "FangSong",
+    "fang song": "FangSong",
+    "仿宋": "FangSong",
+
+    "msyh": "Microsoft YaHei",
+    "microsoft yahei": "Microsoft YaHei",
+    "yahei": "Microsoft YaHei",
+    "微软雅黑": "Microsoft YaHei",
+    "雅黑": "Microsoft YaHei",
+
+    "stxihei": "STXihei",
+    "华文细黑": "STXihei",
+
+    "stkaiti": "STKaiti",
+    "华文楷体": "STKaiti",
+
+    "stsong": "STSong",
+    "华文宋体": "STSong",
+
+    # 日语字体
+    "ms mincho": "MS Mincho",
+    "mincho": "MS Mincho",
+    "ms gothic": "MS Gothic",
+    "gothic": "MS Gothic",
+    "meiryo": "Meiryo",
+
+    # 韩语字体
+    "batang": "Batang",
+    "gulim": "Gulim",
+    "malgun gothic": "Malgun Gothic",
+    "malgun": "Malgun Gothic",
+}
+
+# 字体类别关键词，每个类别编译为一个正则表达式，一次扫描即可判断是否包含任一关键词
+# 顺序即优先级: 如"sans-serif"同时包含两类关键词，按衬线字体处理
+_FONT_CLASS_PATTERNS = (
+    (re.compile("serif|roman|times|ming|song|宋"), "Times New Roman"),
+    (re.compile("sans|arial|helvetica|gothic|hei|黑"), "Arial"),
+    (re.compile("mono|courier|typewriter|console"), "Courier New"),
+)
+
+# 字体名称中逗号之后的样式后缀，如"Arial,Bold"
+_FONT_SUFFIX_RE = re.compile(r',.*$')
+
+# 段落结束标点(中英文)
+_PARA_END_CHARS = frozenset('.!?:;。！？：；')
+
+# 字号对应的Pt对象 - 文档中字号通常只有十几种，Pt为不可变的int子类，可以共享
+_cached_font_size = lru_cache(maxsize=64)(Pt)
+
+def _span_style_key(span):
+    """span的样式键 - 键相同的span由_apply_font_style_to_run设置的样式完全相同"""
+    return (span.get("font", ""), span.get("size", 0), span.get("flags", 0), span.get("color", ""))
+
+def _styled_span_key(span):
+    """_process_text_block_with_style使用的样式键 - 键相同的span设置的运行样式完全相同"""
+    color = span.get("color")
+    if not (color and isinstance(color, list) and len(color) >= 3):
+        color = None
+    else:
+        color = tuple(color[:3])
+    return (span.get("font", ""), span.get("size", 0), bool(span.get("bold", False)),
+            bool(span.get("italic", False)), bool(span.get("underline", False)), color)
+
+def _apply_styled_span_font(run, style_key):
+    """按_styled_span_key给出的样式键逐项设置文本运行的字体属性"""
+    font_name, font_size, bold, italic, underline, color = style_key
+    if font_name:
+        run.font.name = font_name
+    if font_size > 0:
+        run.font.size = _cached_font_size(font_size)
+    if bold:
+        run.font.bold = True
+    if italic:
+        run.font.italic = True
+    if underline:
+        run.font.underline = True
+    if color:
+        run.font.color.rgb = RGBColor(*color)
+
+@lru_cache(maxsize=256)
+def _styled_run_properties(style_key):
+    """
+    样式键对应的<w:rPr>模板 - 在空白文本运行上设置一次字体属性后取出，
+    之后同样式的文本运行直接复制模板，不再逐项调用python-docx的属性设置
+    
+    返回:
+        <w:rPr>元素，样式键未设置任何属性时为None
+    """
+    r = OxmlElement('w:r')
+    _apply_styled_span_font(Run(r, None), style_key)
+    return r.rPr
+
+class _UnprintableToSpace(dict):
+    """
+    str.translate映射表: 不可打印字符(换行、制表符除外)替换为空格，其余字符保持不变
+    
+    按需计算并缓存每个码位的结果，表格文本中出现的不同字符通常只有几百个
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = codepoint if (char.isprintable() or char in '\n\t') else 0x20
+        self[codepoint] = value
+        return value
+
+_UNPRINTABLE_TO_SPACE = _UnprintableToSpace()
+
+# 表格单元格中的连续空格合并为一个(保留换行符)
+_REPEATED_SPACES_RE = re.compile(r' {2,}')
+
+def _rect_tag(rect):
+    """矩形区域在临时文件名中的标识 - 坐标保留1位小数，结果与进程无关(不受PYTHONHASHSEED影响)"""
+    return "%.1f_%.1f_%.1f_%.1f" % (rect[0], rect[1], rect[2], rect[3])
+
+def _block_position_key(block):
+    """文本块阅读顺序排序键 - 先按上边界再按左边界，只取一次bbox"""
+    bbox = block["bbox"]
+    return bbox[1], bbox[0]
+
+# 表格区域文本提取标志 - 与"dict"默认标志相同，但不提取图像块(表格文本分析只使用文本块)
+_TABLE_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# 页面对象上的缓存属性 - 由_release_page_caches统一释放
+# (_etc_text_dict为未排序的文本字典，与增强表格检测共用)
+_PAGE_CACHE_ATTRS = ("_etc_text_dict", "_etc_sorted_text_dict", "_etc_text",
+                     "_etc_tables_cache", "_etc_table_dicts", "_etc_table_images")
+
+# 表格区域按2倍缩放渲染(模板对象，get_pixmap不会修改传入的矩阵)
+_TABLE_ZOOM_MATRIX = fitz.Matrix(2, 2)
+
+# 单元格样式中对齐方式名称到Word枚举的映射，未列出的名称分别按左对齐/垂直居中处理
+_CELL_PARAGRAPH_ALIGNMENTS = {
+    "center": WD_ALIGN_PARAGRAPH.CENTER,
+    "right": WD_ALIGN_PARAGRAPH.RIGHT,
+    "justify": WD_ALIGN_PARAGRAPH.JUSTIFY,
+}
+_CELL_VERTICAL_ALIGNMENTS = {
+    "top": WD_CELL_VERTICAL_ALIGNMENT.TOP,
+    "bottom": WD_CELL_VERTICAL_ALIGNMENT.BOTTOM,
+}
+
+# 表格边框/底纹XML模板 - 每种样式只构建一次，使用时deepcopy到各单元格(模板本身不挂到文档中)
+_BORDER_VALUES = {"single": "single", "double": "double", "dotted": "dotted", "dashed": "dashed"}
+
+@lru_cache(maxsize=8)
+def _table_borders_template(border_style):
+    """四边框的<w:tcBorders>模板，未知样式使用单线"""
+    tcBorders = OxmlElement('w:tcBorders')
+    for border_position in ['top', 'bottom', 'left', 'right']:
+        border = OxmlElement(f'w:{border_position}')
+        border.set(qn('w:val'), _BORDER_VALUES.get(border_style, 'single'))
+        border.set(qn('w:sz'), '4')  # 相当于0.5磅
+        border.set(qn('w:color'), '000000')  # 黑色边框
+        border.set(qn('w:space'), '0')
+        tcBorders.append(border)
+    return tcBorders
+
+@lru_cache(maxsize=1)
+def _header_borders_template():
+    """表头单元格的底部加粗边框模板"""
+    tcBorders = OxmlElement('w:tcBorders')
+    bottomBorder = OxmlElement('w:bottom')
+    bottomBorder.set(qn('w:val'), 'single')
+    bottomBorder.set(qn('w:sz'), '12')  # 2磅线宽
+    bottomBorder.set(qn('w:space'), '0')
+    bottomBorder.set(qn('w:color'), '000000')
+    tcBorders.append(bottomBorder)
+    return tcBorders
+
+@lru_cache(maxsize=256)
+def _shading_template(fill):
+    """指定填充色的<w:shd>模板"""
+    return parse_xml(f'<w:shd {nsdecls("w")} w:fill="{fill}"/>')
+
+def _new_shading(fill):
+    """返回可直接挂到单元格tcPr下的<w:shd>元素"""
+    return deepcopy(_shading_template(fill))
+
+# _apply_html_formatting支持的简单HTML标签 - 从"<"到其后第一个">"视为一个标签
+_HTML_TAG_RE = re.compile(r'(<[^>]*>)')
+# 格式化失败回退为纯文本时要去掉的样式标签
+_HTML_STYLE_TAG_RE = re.compile(r'</?[biu]>')
+_HTML_STYLE_TAGS = {
+    "<b>": ("b", True), "</b>": ("b", False),
+    "<i>": ("i", True), "</i>": ("i", False),
+    "<u>": ("u", True), "</u>": ("u", False),
+}
+
+# 合并单元格检测中用于识别表头的关键词(小写)，编译为一个正则，每个单元格只需搜索一次
+_HEADER_KEYWORDS = ("total", "sum", "合计", "小计", "总计", "标题",
+                    "序号", "编号", "日期", "时间", "姓名", "名称",
+                    "金额", "价格", "数量")
+_HEADER_KEYWORD_RE = re.compile("|".join(map(re.escape, _HEADER_KEYWORDS)))
+
+@lru_cache(maxsize=1024)
+def _map_font_cached(pdf_font_name):
+    """
+    内置的字体映射 - 纯函数，按字体名称缓存映射结果
+    
+    PDF页面中通常只有少量不同的字体名称，却会被查询成千上万次
+    """
+    # 如果没有字体名称，返回默认字体
+    if not pdf_font_name:
+        return "Arial"
+        
+    # 转换为小写便于匹配
+    pdf_font_lower = pdf_font_name.lower().strip()
+
+    # 1. 先尝试完全匹配
+    if pdf_font_lower in _FONT_MAP:
+        return _FONT_MAP[pdf_font_lower]
+
+    # 2. 部分匹配
+    for key, value in _FONT_MAP.items():
+        if key in pdf_font_lower:
+            return value
+
+    # 3. 智能匹配 - 检查常见字体样式词汇(按衬线、无衬线、等宽的优先级)
+    for font_class_re, font_name in _FONT_CLASS_PATTERNS:
+        if font_class_re.search(pdf_font_lower):
+            return font_name
+
+    # 默认返回通用字体
+    return "Arial"
+
+# 页面图像增强参数: 对比度1.08，清晰度1.2
+# 清晰度增强等价于 1.2*原图 - 0.2*平滑图(PIL SMOOTH核)，对比度增强是线性缩放，
+# 二者可合并为一个3x3卷积核，偏移量由平均灰度在运行时给出
+_ENHANCE_CONTRAST = 1.08
+_ENHANCE_SHARPNESS = 1.2
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+_ENHANCE_KERNEL = _ENHANCE_CONTRAST * (
+    (1 - _ENHANCE_SHARPNESS) * _SMOOTH_KERNEL
+    + _ENHANCE_SHARPNESS * np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]], dtype=np.float32)
+)
+
+# 页面抽样后的颜色数超过该阈值时视为照片或扫描类内容，改用JPEG保存
+_JPEG_COLOR_THRESHOLD = 2048
+
+def _is_photographic(pixels):
+    """
+    按行抽样统计页面颜色数，判断页面是否为照片或扫描类内容
+    
+    文字和线条图即使经过抗锯齿，颜色数也很有限；照片和扫描页面的颜色数远超阈值
+    
+    参数:
+        pixels: RGBA像素数组 (高, 宽, 4)
+    """
+    sample = np.ascontiguousarray(pixels[::max(1, pixels.shape[0] // 32)])
+    # 每个RGBA像素正好4字节，按uint32打包后可直接一维去重
+    colors = np.unique(sample.view(np.uint32))
+    return len(colors) > _JPEG_COLOR_THRESHOLD
+
+def _enhance_page_pixels(pixels):
+    """
+    对页面像素进行对比度和清晰度增强，合并为一次卷积完成
+    
+    参数:
+        pixels: RGB像素数组，或预乘透明度的RGBA像素数组(pixmap原始数据)
+        
+    返回:
+        增强后的RGB或RGBA(非预乘)像素数组
+    """
+    has_alpha = pixels.shape[2] == 4
+    if has_alpha:
+        # pixmap中带透明通道的像素是预乘的，先还原为普通RGBA(与保存PNG时一致)
+        pixels = cv2.cvtColor(pixels, cv2.COLOR_mRGBA2RGBA)
+        gray = cv2.cvtColor(pixels, cv2.COLOR_RGBA2GRAY)
+    else:
+        gray = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY)
+    
+    # 与PIL的Contrast一致，以平均灰度为对比度中心
+    mean_gray = int(gray.mean() + 0.5)
+    enhanced = cv2.filter2D(pixels, -1, _ENHANCE_KERNEL,
+                            delta=(1 - _ENHANCE_CONTRAST) * mean_gray,
+                            borderType=cv2.BORDER_REPLICATE)
+    if has_alpha:
+        # 保留原始透明通道
+        enhanced[:, :, 3] = pixels[:, :, 3]
+    return enhanced
+
+def _encode_page_image(page, zoom, enhance=True, image_quality=95):
+    """
+    将页面渲染为高分辨率图像并在内存中编码，可选地进行对比度和清晰度增强
+    
+    文字和线条图编码为无损PNG；照片或扫描类内容编码为JPEG，
+    体积和编码耗时都远小于PNG
+    
+    参数:
+        page: PDF页面
+        zoom: 缩放比例
+        enhance: 是否进行图像增强
+        image_quality: JPEG图像压缩质量
+        
+    返回:
+        tuple: (图像数据, 扩展名 ".png" 或 ".jpg")
+    """
+    # 使用高级渲染选项: 包含透明度，RGB色彩空间
+    mat = fitz.Matrix(zoom, zoom)
+    pix = page.get_pixmap(matrix=mat, alpha=True, colorspace=fitz.csRGB)
+    pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+    
+    use_jpeg = _is_photographic(pixels)
+    if use_jpeg:
+        # JPEG不支持透明通道，将预乘像素合成到白色背景: rgb + (255 - alpha)
+        pixels = pixels[:, :, :3] + (255 - pixels[:, :, 3:])
+    
+    # 低缩放比例下增强效果不可见，跳过增强
+    enhanced = False
+    if enhance and zoom >= 4:
+        try:
+            pixels = _enhance_page_pixels(pixels)
+            enhanced = True
+        except Exception as e:
+            print(f"图像优化失败，使用原始渲染: {e}")
+    
+    if use_jpeg:
+        _, data = cv2.imencode(".jpg", cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR),
+                               [cv2.IMWRITE_JPEG_QUALITY, int(image_quality)])
+        return data.tobytes(), ".jpg"
+    if enhanced:
+        _, data = cv2.imencode(".png", cv2.cvtColor(pixels, cv2.COLOR_RGBA2BGRA),
+                               [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        return data.tobytes(), ".png"
+    # 使用快速压缩编码PNG - 最高压缩级别的deflate在大图上是主要耗时
+    return pix.pil_tobytes(format="PNG", optimize=False, compress_level=1), ".png"
+
+def _render_pixmap_to_image(page, zoom, img_path, enhance=True, image_quality=95):
+    """
+    将页面渲染为图像文件，照片或扫描类内容保存为JPEG(扩展名改为.jpg)
+    
+    参数:
+        page: PDF页面
+        zoom: 缩放比例
+        img_path: 输出图像路径
+        enhance: 是否进行图像增强
+        image_quality: JPEG图像压缩质量
+        
+    返回:
+        实际保存的图像路径
+    """
+    data, ext = _encode_page_image(page, zoom, enhance, image_quality)
+    img_path = os.path.splitext(img_path)[0] + ext
+    with open(img_path, "wb") as f:
+        f.write(data)
+    return img_path
+
+# 当前线程是否正在通过_save_docx保存文档 - 只有此时图像部件才使用快速压缩
+_fast_image_save = threading.local()
+_fast_image_writer_lock = threading.Lock()
+_fast_image_writer_installed = False
+
+def _install_fast_image_writer():
+    """
+    为python-docx的zip写入器安装一次图像快速压缩包装(线程安全，只安装一次，不再还原)
+    
+    包装只在当前线程的_save_docx保存期间生效，其他线程或其他代码保存文档时行为不变；
+    python-docx内部结构变化导致无法安装时返回False
+    """
+    global _fast_image_writer_installed
+    with _fast_image_writer_lock:
+        if _fast_image_writer_installed:
+            return True
+        try:
+            from docx.opc.phys_pkg import _ZipPkgWriter
+            original_write = _ZipPkgWriter.write
+        except (ImportError, AttributeError) as e:
+            print(f"无法启用图像快速压缩，使用默认保存方式: {e}")
+            return False
+        
+        def write(self, pack_uri, blob):
+            if getattr(_fast_image_save, "active", False) and pack_uri.ext.lower() in ("png", "jpg", "jpeg"):
+                self._zipf.writestr(pack_uri.membername, blob, compress_type=ZIP_DEFLATED, compresslevel=1)
+            else:
+                original_write(self, pack_uri, blob)
+        
+        _ZipPkgWriter.write = write
+        _fast_image_writer_installed = True
+        return True
+
+def _save_docx(doc, output_path):
+    """
+    保存Word文档，图像部件(PNG/JPEG)使用最快的deflate压缩级别
+    
+    图像本身已经压缩过，python-docx默认的deflate压缩级别对它们收益很小，
+    却在保存大文档时占用大量CPU，这里在保存期间改为级别1压缩这些图像
+    
+    参数:
+        doc: Word文档对象
+        output_path: 输出文件路径
+    """
+    if not _install_fast_image_writer():
+        doc.save(output_path)
+        return
+    
+    _fast_image_save.active = True
+    try:
+        doc.save(output_path)
+    finally:
+        _fast_image_save.active = False
+
+# 段落对齐方式编码，对应_paragraph_format_core返回的整数
+_PARAGRAPH_ALIGNMENTS = (
+    WD_ALIGN_PARAGRAPH.LEFT,
+    WD_ALIGN_PARAGRAPH.CENTER,
+    WD_ALIGN_PARAGRAPH.RIGHT,
+    WD_ALIGN_PARAGRAPH.JUSTIFY,
+)
+
+def _paragraph_format_core(line_bboxes, page_width):
+    """
+    段落格式检测的数值部分 - 根据各行边界框判断对齐方式和左缩进
+    
+    每个文本块通常只有几行，直接对边界框元组做标量运算，
+    比构建NumPy数组再向量化计算快得多
+    
+    参数:
+        line_bboxes: 各行边界框列表 [(x0, y0, x1, y1), ...]
+        page_width: 页面宽度
+        
+    返回:
+        tuple: (对齐方式编码, 左缩进, 文本块是否位于页面中央)
+               对齐方式编码为_PARAGRAPH_ALIGNMENTS的下标，0(左对齐)表示未能判定
+    """
+    line_count = len(line_bboxes)
+    sum_left = 0.0
+    sum_right = 0.0
+    sum_width = 0.0
+    # 一次遍历同时累加左右边界和行宽，每个边界框只解包一次
+    for x0, _, x1, _ in line_bboxes:
+        sum_left += x0
+        sum_right += x1
+        sum_width += x1 - x0
+    
+    # 计算平均值
+    avg_left = sum_left / line_count
+    avg_right = sum_right / line_count
+    avg_width = sum_width / line_count
+    
+    # 页面中央位置和文本块中心点
+    page_center = page_width / 2
+    block_center = (avg_left + avg_right) / 2
+    
+    # 检测左缩进 - 如果左边距大于20点，认为有缩进
+    left_indent = avg_left if avg_left > 20 else 0.0
+    
+    # 检查是否为居中对齐 - 10%的页面宽度作为容差
+    is_centered = abs(block_center - page_center) < page_width * 0.1
+    if is_centered and avg_width < page_width * 0.7:
+        # 文本宽度小于页面宽度的70%，更可能是居中的
+        return 1, 0.0, is_centered
+    
+    # 检查是否为右对齐 - 右边距小，左边距大
+    if page_width - avg_right < 50 and avg_left > 100:
+        return 2, 0.0, is_centered
+    
+    # 检查是否为两端对齐（判断标准：多行文本，且最后一行明显短于其他行）
+    if line_count > 1:
+        last_x0, _, last_x1, _ = line_bboxes[-1]
+        last_line_width = last_x1 - last_x0
+        avg_other_width = (sum_width - last_line_width) / (line_count - 1)
+        
+        # 如果最后一行明显短于其他行（小于80%），可能是两端对齐
+        if last_line_width < avg_other_width * 0.8 and avg_width > page_width * 0.7:
+            return 3, left_indent, is_centered
+    
+    return 0, left_indent, is_centered
+
+# 进程池中每个工作进程持有的PDF文档，由_init_render_worker打开一次后供所有任务复用
+_worker_pdf_document = None
+
+def _init_render_worker(pdf_bytes):
+    """
+    进程池初始化函数 - 每个工作进程只解析一次PDF
+    
+    参数:
+        pdf_bytes: PDF文件内容
+    """
+    global _worker_pdf_document
+    _worker_pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+def _render_page_worker(page_num, zoom, temp_dir, enhance=True, image_quality=95):
+    """
+    进程池工作函数 - 在子进程中渲染单个页面
+    
+    返回:
+        渲染后的图像路径
+    """
+    img_path = os.path.join(temp_dir, f"page_hq_{page_num}.png")
+    return _render_pixmap_to_image(_worker_pdf_document[page_num], zoom, img_path, enhance, image_quality)
+
 class EnhancedPDFConverter:
     """增强型PDF转换工具类，精确保留PDF原始格式"""    
     def __init__(self):
@@ -99,6 +634,25 @@ class EnhancedPDFConverter:
         self.force_image_for_tables = True  # 表格区域强制使用图像模式
         self.force_font_embedding = True  # 强制嵌入字体
         self.layout_tolerance = 5  # 布局识别容差值(越小越精确)
+        self.override_grid_borders = False  # 单线边框时也为每个单元格写入显式边框(默认由Table Grid样式提供)
+        
+        # 页面渲染缓存 - 相同PDF页面再次转换时直接复用已渲染的图像
+        self.use_page_cache = True
+        self.page_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "enhanced_pdf_converter")
+        self.page_cache_max_bytes = 2 * 1024 ** 3  # 缓存目录最大2GB，超出时淘汰最久未使用的图像
+        self.page_cache_max_age_days = 7  # 超过该天数未使用的缓存图像直接删除
+        self._pdf_digest = None
+        
+        # 逐块/逐单元格处理出错时是否打印完整堆栈(设置环境变量PDFCONV_VERBOSE开启)，
+        # 问题PDF中同类错误可能出现成千上万次
+        self._verbose = bool(os.environ.get("PDFCONV_VERBOSE"))
+        
+        # 文本运行样式缓存 - 文档中不同的字体名称和颜色值很少，每个只解析一次
+        self._font_cache = {}
+        self._color_cache = {}
+        
+        # 转换器修复和表格检测增强在首次检测非最大保留模式的页面复杂度时应用一次
+        self._converter_fixes_applied = False
         
         # 初始化专用的格式保留管理器
         try:
@@ -107,129 +661,269 @@ class EnhancedPDFConverter:
         except Exception as e:
             print(f"初始化高级表格修复失败: {e}")
 
-    def _is_complex_page(self, page):
-            """检测页面是否包含复杂内容"""
-            # 获取页面内容统计
-            text = page.get_text()
-            blocks = page.get_text("dict")["blocks"]
+    def _init_converter_fixes(self):
+        """获取颜色管理器，并应用PDF转换器修复和表格检测增强 - 每个转换器只应用一次，重复调用直接返回"""
+        if getattr(self, '_converter_fixes_applied', False):
+            return
+        self._converter_fixes_applied = True
+        
+        try:
+            # 使用模块集成器获取颜色管理器
+            import pdf_module_integrator
+            self.color_manager = pdf_module_integrator.get_color_manager()
+            self._has_color_manager = self.color_manager is not None
+        except ImportError as e:
+            print(f"无法导入模块集成器: {e}")
+            self.color_manager = None
+            self._has_color_manager = False
+        
+        # 应用修复和增强
+        try:
+            import pdf_converter_fix
+            pdf_converter_fix.apply_enhanced_pdf_converter_fixes(self)
+            print("已应用PDF转换器增强修复")
+        except ImportError:
+            print("修复模块不可用，将尝试加载替代方法")
             
-            # 增强图像检测 - 使用多种方法检测图像
-            image_blocks = []
+        # 尝试加载表格检测功能 - 优先使用增强型表格检测
+        try:
+            from enhanced_table_detection import apply_enhanced_table_detection_patch
+            apply_enhanced_table_detection_patch(self)
+            print("已加载增强型表格检测功能")
+        except ImportError:
+            # 尝试加载基础表格检测功能
+            try:
+                from table_detection_utils import add_table_detection_capability
+                add_table_detection_capability(self)
+                print("已加载基础表格检测功能")
+            except ImportError:
+                print("无法导入表格检测工具，可能影响表格识别功能")
+
+    def _find_tables_cached(self, page):
+        """
+        获取页面的表格检测结果，结果缓存在页面对象上，避免同一页面重复执行find_tables
+        
+        参数:
+            page: PDF页面
             
-            # 方法1: 基于块类型检测图像
-            basic_image_blocks = [b for b in blocks if b["type"] == 1]
-            image_blocks.extend(basic_image_blocks)
+        返回:
+            TableFinder对象
+        """
+        table_finder = getattr(page, "_etc_tables_cache", None)
+        if table_finder is None:
+            table_finder = page.find_tables()
+            page._etc_tables_cache = table_finder
+        return table_finder
+
+    def _page_dict(self, page):
+        """
+        获取页面的文本字典(按阅读顺序排序)，结果缓存在页面对象上，
+        避免复杂度检测和元素处理重复解析页面内容流
+        
+        注意: 返回的是共享的缓存数据，调用方如需排序或增删块应先复制blocks列表
+        
+        参数:
+            page: PDF页面
             
-            # 方法2: 使用get_images方法检测嵌入图像
-            try:
-                embedded_images = page.get_images()
-                if embedded_images and len(embedded_images) > 0:
-                    # 将嵌入图像的信息添加到图像块列表
-                    for img in embedded_images:
-                        # 检查这个图像是否已经在基本图像块中
-                        xref = img[0]
-                        already_detected = any(b.get("xref") == xref for b in basic_image_blocks)
-                        
-                        if not already_detected:
-                            # 创建一个表示此图像的块
-                            image_blocks.append({
-                                "type": 1,  # 图像类型
-                                "xref": xref,
-                                "is_additional_image": True
-                            })
-            except Exception as e:
-                print(f"使用get_images方法检测图像时出错: {e}")
+        返回:
+            dict: 与page.get_text("dict", sort=True)相同的结果
+        """
+        page_dict = getattr(page, "_etc_sorted_text_dict", None)
+        if page_dict is None:
+            # 未排序的文本字典与增强表格检测共用(同一属性)，此处只另建排序后的块列表，
+            # 排序方式与PyMuPDF的sort=True一致(按块底边、左边稳定排序)
+            raw_dict = getattr(page, "_etc_text_dict", None)
+            if raw_dict is None:
+                raw_dict = page._etc_text_dict = page.get_text("dict")
+            page_dict = dict(raw_dict)
+            page_dict["blocks"] = sorted(raw_dict["blocks"], key=lambda b: (b["bbox"][3], b["bbox"][0]))
+            page._etc_sorted_text_dict = page_dict
+        return page_dict
+
+    def _release_page_caches(self, page):
+        """
+        释放页面对象上缓存的文本、表格检测和表格区域结果，
+        用于在页面对象仍被引用(如检测到的表格)但其缓存已不再需要时释放内存
+        
+        参数:
+            page: PDF页面
+        """
+        for attr in _PAGE_CACHE_ATTRS:
+            if hasattr(page, attr):
+                delattr(page, attr)
+
+    def _page_text(self, page):
+        """
+        获取页面的纯文本，结果缓存在页面对象上
+        
+        参数:
+            page: PDF页面
             
-            # 检查是否有图像
-            has_images = len(image_blocks) > 0
+        返回:
+            str: page.get_text()的结果
+        """
+        text = getattr(page, "_etc_text", None)
+        if text is None:
+            text = page.get_text()
+            page._etc_text = text
+        return text
+
+    def _table_region_dict(self, page, table_rect):
+        """
+        获取表格区域的文本字典(只含文本块)，结果按区域缓存在页面对象上，
+        同一表格的数据提取和样式检测共用一次提取结果
+        
+        注意: 返回的是共享的缓存数据，调用方不应修改blocks列表
+        
+        参数:
+            page: PDF页面
+            table_rect: 表格区域
             
-            # 检查文本块数量
-            text_blocks = [b for b in blocks if b["type"] == 0]
-            many_text_blocks = len(text_blocks) > 15
+        返回:
+            dict: page.get_text("dict", clip=表格区域)的结果
+        """
+        extracted = getattr(page, "_etc_table_dicts", None)
+        if extracted is None:
+            extracted = page._etc_table_dicts = {}
+        key = tuple(table_rect)
+        table_text = extracted.get(key)
+        if table_text is None:
+            table_text = page.get_text("dict", clip=fitz.Rect(table_rect), flags=_TABLE_TEXT_FLAGS)
+            extracted[key] = table_text
+        return table_text
+
+    def _table_region_image(self, page, table_rect):
+        """
+        将表格区域按2倍缩放渲染为PNG，渲染结果按区域缓存在页面对象上，
+        表格结构提取失败回退为图像时不再重复渲染同一区域；
+        启用页面缓存时同一PDF再次转换直接使用缓存目录中的图像
+        
+        参数:
+            page: PDF页面
+            table_rect: 表格区域
             
-            # 检查是否有表格
-            # TableFinder对象不支持len()操作，改用其他方法检测表格
-            try:
-                # 使用表格特征检测是否存在表格
-                tables_dict = page.find_tables().extract()
-                has_tables = len(tables_dict) > 0
-            except:
-                # 备用方法：检查页面文本是否包含表格特征
-                text_lower = text.lower()
-                table_indicators = ['table', '表格', '列表', 'column', 'row', '行', '列']
-                table_structure = text.count('|') > 5 or text.count('\t') > 5
-                has_tables = any(indicator in text_lower for indicator in table_indicators) or table_structure
-            
-            # 检查是否有复杂布局
-            has_complex_layout = False
-            
-            # 分析文本块的位置分布
-            if len(text_blocks) > 5:
-                # 收集所有文本块的x坐标
-                x_positions = []
-                for block in text_blocks:
-                    x_positions.append(block["bbox"][0])  # 左边界
+        返回:
+            str: 图像文件路径
+        """
+        rendered = getattr(page, "_etc_table_images", None)
+        if rendered is None:
+            rendered = page._etc_table_images = {}
+        key = tuple(table_rect)
+        img_path = rendered.get(key)
+        if img_path is None or not os.path.exists(img_path):
+            # 区域标识与进程无关(hash(str(...))受PYTHONHASHSEED影响)，可用作跨次运行的缓存键
+            rect_id = hashlib.sha1("|".join(f"{v:.2f}" for v in key).encode("utf-8")).hexdigest()[:16]
+            cache_path = self._table_cache_path(page.number, rect_id)
+            img_path = self._lookup_page_cache(cache_path)
+            if img_path is None:
+                clip_rect = fitz.Rect(table_rect)
+                pix = page.get_pixmap(matrix=_TABLE_ZOOM_MATRIX, clip=clip_rect)
                 
-                # 如果x坐标分布在多个不同位置，可能是多列布局
-                x_pos_counter = Counter(int(x // 20) * 20 for x in x_positions)  # 按20点为间隔分组
-                distinct_x_pos = len([k for k, v in x_pos_counter.items() if v > 2])  # 至少出现3次的x位置
-                has_complex_layout = distinct_x_pos >= 3
-            
-            # 增强格式保留模式下更积极地判定为复杂页面
-            if hasattr(self, 'format_preservation_level'):
-                if self.format_preservation_level == "maximum":
-                    # 最大保留模式 - 只要有任何一个复杂因素就判定为复杂
-                    return has_images or has_tables or has_complex_layout or many_text_blocks
-                elif self.format_preservation_level == "enhanced":
-                    # 增强保留模式 - 至少两个复杂因素
-                    complexity_factors = sum([has_images, has_tables, has_complex_layout, many_text_blocks])
-                # print(f"初始化高级表格修复失败: {e}")
+                # 保存为临时图像文件
+                img_path = os.path.join(self.temp_dir, f"table_img_{page.number}_{rect_id}.png")
+                pix.save(img_path)
+                self._store_page_cache(img_path, cache_path)
+            rendered[key] = img_path
+        return img_path
+
+    def _paragraph_text(self, paragraph):
+        """
+        获取Word段落的文本，已读取的运行文本缓存在段落对象上
+        
+        python-docx的Paragraph.text每次都要遍历所有运行的XML，段落随文本块不断追加运行时
+        开销为O(运行数)。转换过程中段落只会追加运行，并可能在最后一个运行后追加换行，
+        因此缓存除最后一个运行以外的文本，之后只需读取最后一个运行和新增的运行
+        
+        参数:
+            paragraph: Word段落对象
             
-            try:
-                # 使用模块集成器获取颜色管理器
-                import pdf_module_integrator
-                self.color_manager = pdf_module_integrator.get_color_manager()
-                self._has_color_manager = self.color_manager is not None
-            except ImportError as e:
-                print(f"无法导入模块集成器: {e}")
-                self.color_manager = None
-                # self._has_color_manager = Falsetry:
-                # 使用相对导入或绝对导入路径
-                try:
-                    from pdf_font_manager import PDFFontManager
-                except ImportError:
-                    # 尝试使用绝对导入
-                    import sys
-                    import os
-                    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-                    from pdf_font_manager import PDFFontManager
-                self.font_manager = PDFFontManager()
-                self._has_font_manager = True
-            except ImportError as e:
-                print(f"无法导入字体管理器: {e}")
-                self._has_font_manager = False
-                # 应用修复和增强
-            try:
-                import pdf_converter_fix
-                pdf_converter_fix.apply_enhanced_pdf_converter_fixes(self)
-                print("已应用PDF转换器增强修复")
-            except ImportError:
-                print("修复模块不可用，将尝试加载替代方法")
-                
-            # 尝试加载表格检测功能 - 优先使用增强型表格检测
-            try:
-                from enhanced_table_detection import apply_enhanced_table_detection_patch
-                apply_enhanced_table_detection_patch(self)
-                print("已加载增强型表格检测功能")
-            except ImportError:
-                # 尝试加载基础表格检测功能
-                try:
-                    from table_detection_utils import add_table_detection_capability
-                    add_table_detection_capability(self)
-                    print("已加载基础表格检测功能")
-                except ImportError:
-                    print("无法导入表格检测工具，可能影响表格识别功能")
+        返回:
+            str: 与paragraph.text相同的文本
+        """
+        elements = paragraph._p.xpath("w:r | w:hyperlink")
+        if not elements:
+            return ""
+        
+        count, last_element, prefix = getattr(paragraph, "_etc_text_prefix", (0, None, ""))
+        # 缓存的运行已被删除或替换时重新读取整个段落
+        if count and (count >= len(elements) or elements[count - 1] is not last_element):
+            count, prefix = 0, ""
+            paragraph._etc_text_prefix = (0, None, "")
+        
+        if count < len(elements) - 1:
+            prefix += "".join(e.text for e in elements[count:-1])
+            paragraph._etc_text_prefix = (len(elements) - 1, elements[-2], prefix)
+        
+        return prefix + elements[-1].text
 
+    def _is_complex_page(self, page):
+        """
+        检测页面是否包含复杂内容
+        
+        最大保留模式只要有一个复杂因素就判定为复杂，增强保留模式至少需要两个，标准模式不判定复杂页面。
+        按开销从低到高依次检测图像、文本块数量、表格和多列布局，
+        复杂因素数量一旦达到要求(或已不可能达到)就立即返回
+        """
+        level = getattr(self, 'format_preservation_level', "standard")
+        if level != "maximum":
+            self._init_converter_fixes()
+        required_factors = {"maximum": 1, "enhanced": 2}.get(level)
+        if required_factors is None:
+            return False
+        factors = 0
+        
+        # 1. 检查是否有图像 - get_images只读取页面资源列表，开销最低
+        try:
+            has_images = len(page.get_images()) > 0
+        except Exception as e:
+            print(f"使用get_images方法检测图像时出错: {e}")
+            has_images = False
+        
+        blocks = self._page_dict(page)["blocks"]
+        if not has_images:
+            # 备用: 基于块类型检测图像(内联图像不会出现在get_images中)
+            has_images = any(b["type"] == 1 for b in blocks)
+        
+        factors += has_images
+        if factors >= required_factors:
+            return True
+        
+        # 2. 检查文本块数量
+        text_blocks = [b for b in blocks if b["type"] == 0]
+        factors += len(text_blocks) > 15
+        if factors >= required_factors:
+            return True
+        
+        # 3. 检查是否有表格 - 检查页面文本是否包含表格特征
+        # 原实现先调用page.find_tables().extract()，但TableFinder没有extract方法，
+        # 总是抛出异常并回退到文本特征判断；这里直接使用文本特征，保持原有判定结果，
+        # 同时省去一次无用的表格检测
+        text = self._page_text(page)
+        text_lower = text.lower()
+        table_indicators = ['table', '表格', '列表', 'column', 'row', '行', '列']
+        table_structure = text.count('|') > 5 or text.count('\t') > 5
+        has_tables = any(indicator in text_lower for indicator in table_indicators) or table_structure
+        
+        factors += has_tables
+        if factors >= required_factors:
+            return True
+        if factors + 1 < required_factors:
+            return False
+        
+        # 4. 检查是否有复杂布局 - 分析文本块的位置分布
+        if len(text_blocks) <= 5:
+            return False
+        
+        # 收集所有文本块的x坐标(左边界)
+        x_positions = np.fromiter((b["bbox"][0] for b in text_blocks),
+                                  dtype=np.float64, count=len(text_blocks))
+        
+        # 如果x坐标分布在多个不同位置，可能是多列布局
+        x_bins = (x_positions // 20).astype(np.int64)  # 按20点为间隔分组
+        # 只统计实际出现的分组，个别页外坐标不会放大计数数组
+        _, x_bin_counts = np.unique(x_bins, return_counts=True)
+        distinct_x_pos = int((x_bin_counts > 2).sum())  # 至少出现3次的x位置
+        return factors + (distinct_x_pos >= 3) >= required_factors
        
     @property
     def dpi(self):
@@ -410,24 +1104,30 @@ class EnhancedPDFConverter:
                 section.top_margin = Cm(1.5)
                 section.bottom_margin = Cm(1.5)
             
+            # 使用进程池并行渲染所有页面，然后按页码顺序插入文档
+            page_images = self._render_pages_parallel(doc, pdf_document)
+            
             # 处理每一页
             for page_num in range(page_count):
                 page = pdf_document[page_num]
                 
                 # 渲染页面为图像并添加到文档
-                self._render_page_as_image(doc, page)
+                self._render_page_as_image(doc, page, page_images.get(page_num))
                 
                 # 添加分页符（除了最后一页）
                 if page_num < page_count - 1:
                     doc.add_page_break()
             
+            # 控制页面渲染缓存大小
+            self._evict_page_cache()
+            
             # 生成输出文件路径
             pdf_filename = os.path.basename(self.pdf_path)
             output_filename = os.path.splitext(pdf_filename)[0] + ".docx"
             output_path = os.path.join(self.output_dir, output_filename)
             
             # 保存Word文档
-            doc.save(output_path)
+            _save_docx(doc, output_path)
             
             print(f"成功将PDF转换为Word(高级模式): {output_path}")
             return output_path
@@ -438,9 +1138,46 @@ class EnhancedPDFConverter:
         finally:
             self.cleanup()
     
-    def _render_page_as_image(self, doc, page):
-        """将整个页面渲染为高质量图像并添加到文档，确保完全精确保留原始格式"""
-        # 根据格式保留级别设置缩放比例
+    def _doc_page_geometry(self, doc):
+        """
+        获取Word文档第一节的页面宽度和左右页边距(英寸)，结果缓存在文档对象上
+        
+        doc.sections每次访问都要在整个文档body中查找节属性，文档越长越慢；
+        第一节的页面设置在创建文档时确定，之后不再改变
+        
+        返回:
+            tuple: (页面宽度, 左边距, 右边距)
+        """
+        geometry = getattr(doc, "_etc_page_geometry", None)
+        if geometry is None:
+            section = doc.sections[0]
+            geometry = (section.page_width.inches, section.left_margin.inches, section.right_margin.inches)
+            doc._etc_page_geometry = geometry
+        return geometry
+    
+    def _get_max_image_width(self, doc):
+        """获取Word文档中图像可用的最大宽度(英寸)"""
+        max_width_inches = 6.5  # 默认最大宽度
+        try:
+            # 获取当前部分的可用宽度
+            section_width, left_margin, right_margin = self._doc_page_geometry(doc)
+            margins = left_margin + right_margin
+            max_width_inches = section_width - margins - 0.1  # 减去0.1英寸的安全边距
+        except:
+            pass
+        return max_width_inches
+    
+    def _get_render_zoom(self, page_width=None, max_width_inches=None):
+        """
+        根据格式保留级别和DPI计算页面渲染的缩放比例
+        
+        参数:
+            page_width: 页面宽度(点)
+            max_width_inches: 图像在Word中的最大插入宽度(英寸)
+        
+        给出页面宽度和插入宽度时，缩放比例不超过按目标DPI在插入尺寸下所需的分辨率，
+        避免渲染出远超Word显示和打印需要的超大图像
+        """
         if hasattr(self, 'format_preservation_level') and self.format_preservation_level == "maximum":
             zoom = 12  # 超高质量
         elif hasattr(self, 'format_preservation_level') and self.format_preservation_level == "enhanced":
@@ -452,57 +1189,223 @@ class EnhancedPDFConverter:
         dpi_zoom = int(self.dpi) / 72.0  # 72 DPI是PDF的标准分辨率
         zoom = max(zoom, dpi_zoom)  # 使用较大的缩放比例
         
-        # 使用高级渲染选项
-        render_options = {
-            "alpha": True,  # 包含透明度
-            "colorspace": fitz.csRGB,  # RGB色彩空间
-        }
+        # 按实际插入宽度限制缩放比例
+        if page_width and max_width_inches:
+            img_width_inches = min(page_width / 72.0, max_width_inches)
+            zoom = min(zoom, img_width_inches * int(self.dpi) / page_width)
         
-        # 渲染为高分辨率图像
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, **render_options)
+        return zoom
+    
+    def _get_pdf_digest(self):
+        """计算当前PDF文件内容的SHA1摘要(按路径、大小和修改时间缓存)"""
+        stat = os.stat(self.pdf_path)
+        file_id = (self.pdf_path, stat.st_size, stat.st_mtime)
+        if self._pdf_digest is None or self._pdf_digest[0] != file_id:
+            sha1 = hashlib.sha1()
+            with open(self.pdf_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha1.update(chunk)
+            self._pdf_digest = (file_id, sha1.hexdigest())
+        return self._pdf_digest[1]
+    
+    def _page_cache_path(self, page_num, zoom, enhance, image_quality):
+        """
+        获取页面渲染缓存文件路径(不含扩展名)，未启用缓存时返回None
         
-        # 保存为临时图像
-        img_path = os.path.join(self.temp_dir, f"page_hq_{page.number}.png")
-        pix.save(img_path, output="png")  # 保存为PNG格式以保持最高质量
+        缓存键包含所有影响编码结果的参数(缩放比例、DPI、图像增强和JPEG质量)
+        """
+        if not getattr(self, 'use_page_cache', False) or not self.pdf_path:
+            return None
+        try:
+            key_source = (f"{self._get_pdf_digest()}|{page_num}|{zoom:.4f}|{int(self.dpi)}|"
+                          f"{bool(enhance)}|{int(image_quality)}")
+            key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()
+            os.makedirs(self.page_cache_dir, exist_ok=True)
+            return os.path.join(self.page_cache_dir, key)
+        except OSError as e:
+            print(f"页面缓存不可用: {e}")
+            return None
+    
+    def _table_cache_path(self, page_num, rect_id):
+        """获取表格区域渲染缓存文件路径(不含扩展名)，未启用缓存时返回None"""
+        if not getattr(self, 'use_page_cache', False) or not self.pdf_path:
+            return None
+        try:
+            key_source = f"{self._get_pdf_digest()}|table|{page_num}|{rect_id}"
+            key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()
+            os.makedirs(self.page_cache_dir, exist_ok=True)
+            return os.path.join(self.page_cache_dir, key)
+        except OSError as e:
+            print(f"页面缓存不可用: {e}")
+            return None
+    
+    def _lookup_page_cache(self, cache_path):
+        """查找页面渲染缓存(PNG或JPEG)，命中时更新访问时间并返回图像路径"""
+        if not cache_path:
+            return None
+        for ext in (".png", ".jpg"):
+            if os.path.exists(cache_path + ext):
+                try:
+                    os.utime(cache_path + ext)  # 更新修改时间，用于LRU淘汰
+                    return cache_path + ext
+                except OSError:
+                    pass
+        return None
+    
+    def _store_page_cache(self, img_path, cache_path):
+        """将渲染好的页面图像写入缓存，保留图像的扩展名"""
+        if cache_path:
+            try:
+                # 先复制到临时文件再替换，避免写入中断或并发读取时得到不完整的缓存图像
+                ext = os.path.splitext(img_path)[1]
+                tmp_path = cache_path + ext + ".tmp"
+                shutil.copyfile(img_path, tmp_path)
+                os.replace(tmp_path, cache_path + ext)
+            except OSError as e:
+                print(f"写入页面缓存失败: {e}")
+    
+    def _store_page_cache_data(self, data, ext, cache_path):
+        """将内存中编码好的页面图像直接写入缓存"""
+        if cache_path:
+            try:
+                # 先写入临时文件再替换，避免写入中断留下不完整的缓存图像
+                tmp_path = cache_path + ext + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path + ext)
+            except OSError as e:
+                print(f"写入页面缓存失败: {e}")
+    
+    def _evict_page_cache(self):
+        """删除过期的缓存图像，再按修改时间淘汰最旧的缓存图像，使缓存目录不超过设定大小"""
+        if not getattr(self, 'use_page_cache', False) or not os.path.isdir(self.page_cache_dir):
+            return
+        try:
+            expire_before = time.time() - self.page_cache_max_age_days * 86400
+            entries = []
+            total_size = 0
+            with os.scandir(self.page_cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        if stat.st_mtime < expire_before:
+                            os.remove(entry.path)
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+            
+            if total_size <= self.page_cache_max_bytes:
+                return
+            
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.page_cache_max_bytes:
+                    break
+                os.remove(path)
+                total_size -= size
+        except OSError as e:
+            print(f"清理页面缓存失败: {e}")
+    
+    def _render_pages_parallel(self, doc, pdf_document):
+        """
+        使用进程池并行渲染所有页面
+        
+        页面栅格化和图像增强都是CPU密集型操作，使用多进程而不是多线程
+        
+        参数:
+            doc: Word文档对象
+            pdf_document: PDF文档
+            
+        返回:
+            dict: {页码: 图像路径}，渲染失败的页面不包含在内，由调用方逐页渲染
+        """
+        page_count = len(pdf_document)
+        page_images = {}
+        if page_count < 2:
+            return page_images
+        
+        max_width_inches = self._get_max_image_width(doc)
+        enhance = bool(getattr(self, 'smart_color_management', False))
+        image_quality = getattr(self, 'image_compression_quality', 95)
+        
+        # 先查找缓存，只有未命中的页面才需要渲染
+        pending = []
+        for page_num in range(page_count):
+            zoom = self._get_render_zoom(pdf_document[page_num].rect.width, max_width_inches)
+            cache_path = self._page_cache_path(page_num, zoom, enhance, image_quality)
+            cached = self._lookup_page_cache(cache_path)
+            if cached:
+                page_images[page_num] = cached
+            else:
+                pending.append((page_num, zoom, cache_path))
+        if not pending:
+            return page_images
         
-        # 使用PIL进行图像优化
         try:
-            with Image.open(img_path) as img:
-                # 应用图像增强
-                if hasattr(self, 'smart_color_management') and self.smart_color_management:
-                    # 增强对比度
-                    enhancer = ImageEnhance.Contrast(img)
-                    img = enhancer.enhance(1.08)  # 轻微增强对比度
-                    
-                    # 增强清晰度
-                    enhancer = ImageEnhance.Sharpness(img)
-                    img = enhancer.enhance(1.2)
-                
-                # 保存优化后的图像
-                img.save(img_path, format='PNG', optimize=True, 
-                       quality=self.image_compression_quality if hasattr(self, 'image_compression_quality') else 95)
+            # 父进程只读取一次PDF内容，每个工作进程通过initializer解析一次
+            with open(self.pdf_path, "rb") as f:
+                pdf_bytes = f.read()
+            
+            max_workers = min(os.cpu_count() or 1, len(pending))
+            # 显式使用spawn启动工作进程: GUI在工作线程中调用转换，
+            # 在多线程(Tk/OpenCV)进程中fork可能导致子进程死锁，而死锁不会触发下面的异常回退
+            mp_context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                     initializer=_init_render_worker,
+                                     initargs=(pdf_bytes,)) as executor:
+                futures = {}
+                for page_num, zoom, cache_path in pending:
+                    future = executor.submit(_render_page_worker, page_num, zoom,
+                                             self.temp_dir, enhance, image_quality)
+                    futures[future] = (page_num, cache_path)
+                for future in as_completed(futures):
+                    page_num, cache_path = futures[future]
+                    try:
+                        page_images[page_num] = future.result()
+                        self._store_page_cache(page_images[page_num], cache_path)
+                    except Exception as e:
+                        print(f"并行渲染第{page_num + 1}页失败，将逐页渲染: {e}")
         except Exception as e:
-            print(f"图像优化失败，使用原始渲染: {e}")
+            print(f"并行渲染页面失败，将逐页渲染: {e}")
+        
+        return page_images
+    
+    def _render_page_as_image(self, doc, page, img_path=None):
+        """
+        将整个页面渲染为高质量图像并添加到文档，确保完全精确保留原始格式
         
+        参数:
+            doc: Word文档对象
+            page: PDF页面
+            img_path: 已预先渲染好的页面图像路径，为None时在当前进程中渲染
+        """
         # 获取页面尺寸并精确计算Word文档中的图像尺寸
         width_inches = page.rect.width / 72.0  # 转换为英寸
         
         # 确保图像尺寸适应Word页面，同时保留原始宽高比
-        max_width_inches = 6.5  # 默认最大宽度
-        try:
-            # 获取当前部分的可用宽度
-            section_width = doc.sections[0].page_width.inches
-            margins = doc.sections[0].left_margin.inches + doc.sections[0].right_margin.inches
-            max_width_inches = section_width - margins - 0.1  # 减去0.1英寸的安全边距
-        except:
-            pass
+        max_width_inches = self._get_max_image_width(doc)
+        
+        if img_path is None:
+            zoom = self._get_render_zoom(page.rect.width, max_width_inches)
+            enhance = bool(getattr(self, 'smart_color_management', False))
+            image_quality = getattr(self, 'image_compression_quality', 95)
+            cache_path = self._page_cache_path(page.number, zoom, enhance, image_quality)
+            img_path = self._lookup_page_cache(cache_path)
+            if img_path is None:
+                # 在内存中编码后直接添加到文档，无需写入临时文件再读回
+                data, ext = _encode_page_image(page, zoom, enhance=enhance, image_quality=image_quality)
+                self._store_page_cache_data(data, ext, cache_path)
+                image_source = io.BytesIO(data)
+            else:
+                image_source = img_path
+        else:
+            image_source = img_path
         
         # 添加图像到文档
         try:
             # 使用精确宽度的图片添加方式
             img_width = min(width_inches, max_width_inches)
-            doc.add_picture(img_path, width=Inches(img_width))
+            doc.add_picture(image_source, width=Inches(img_width))
             
             # 为图像添加精确的对齐方式
             last_paragraph = doc.paragraphs[-1]
@@ -514,7 +1417,17 @@ class EnhancedPDFConverter:
             p = doc.add_paragraph()
             p.alignment = WD_ALIGN_PARAGRAPH.CENTER
             r = p.add_run()
-            r.add_picture(img_path, width=Inches(min(width_inches, max_width_inches)))    
+            if hasattr(image_source, 'seek'):
+                image_source.seek(0)
+            r.add_picture(image_source, width=Inches(min(width_inches, max_width_inches)))
+        
+        # python-docx在添加图片时已读入图像数据，临时目录中的渲染文件可立即删除(缓存文件保留)
+        if img_path and self.temp_dir and os.path.dirname(os.path.abspath(img_path)) == os.path.abspath(self.temp_dir):
+            try:
+                os.unlink(img_path)
+            except OSError:
+                pass
+    
     def _map_font(self, pdf_font_name):
         """将PDF字体名称映射到Word字体 - 增强版本"""
         try:
@@ -527,129 +1440,7 @@ class EnhancedPDFConverter:
     
     def _map_font_internal(self, pdf_font_name):
         """内置的字体映射方法"""
-        # 如果没有字体名称，返回默认字体
-        if not pdf_font_name:
-            return "Arial"
-            
-        # 转换为小写便于匹配
-        pdf_font_lower = pdf_font_name.lower().strip()
-        
-        # 详细的字体映射表
-        font_map = {
-            # 基本字体
-            "times": "Times New Roman",
-            "times-roman": "Times New Roman",
-            "timesnewroman": "Times New Roman",
-            "timesnew": "Times New Roman",
-            "times new roman": "Times New Roman",
-            "roman": "Times New Roman",
-            
-            # Arial/Helvetica 字体家族
-            "arial": "Arial",
-            "helvetica": "Arial",
-            "helv": "Arial",
-            "helveticaneue": "Arial",
-            "helvetica neue": "Arial",
-            "sans-serif": "Arial",
-            "sans serif": "Arial",
-            
-            # Courier 字体家族
-            "courier": "Courier New",
-            "couriernew": "Courier New",
-            "courier new": "Courier New",
-            "cour": "Courier New",
-           
-            "garamond": "Garamond",
-            "book antiqua": "Book Antiqua",
-            "bookman": "Bookman Old Style",
-            "palatino": "Palatino Linotype",
-            "century": "Century Schoolbook",
-            "candara": "Candara",
-            "consolas": "Consolas",
-            "constantia": "Constantia",
-            "corbel": "Corbel",
-            "franklin": "Franklin Gothic",
-            "gill": "Gill Sans",
-            "lucida": "Lucida Sans",
-            
-            # 中文字体
-            "simsum": "SimSun",
-            "simsun": "SimSun",
-            "songti": "SimSun",
-            "sim sun": "SimSun",
-            "宋体": "SimSun",
-            "宋": "SimSun",
-            
-            "simhei": "SimHei",
-            "heiti": "SimHei",
-            "sim hei": "SimHei",
-            "黑体": "SimHei",
-            "黑": "SimHei",
-            
-            "kaiti": "KaiTi",
-            "kai": "KaiTi",
-            "楷体": "KaiTi",
-            "楷": "KaiTi",
-            
-            "fangsong": "FangSong",
-            "fang song": "FangSong",
-            "仿宋": "FangSong",
-            
-            "msyh": "Microsoft YaHei",
-            "microsoft yahei": "Microsoft YaHei",
-            "yahei": "Microsoft YaHei",
-            "微软雅黑": "Microsoft YaHei",
-            "雅黑": "Microsoft YaHei",
-            
-            "stxihei": "STXihei",
-            "华文细黑": "STXihei",
-            
-            "stkaiti": "STKaiti",
-            "华文楷体": "STKaiti",
-            
-            "stsong": "STSong",
-            "华文宋体": "STSong",
-            
-            # 日语字体
-            "ms mincho": "MS Mincho",
-            "mincho": "MS Mincho",
-            "ms gothic": "MS Gothic",
-            "gothic": "MS Gothic",
-            "meiryo": "Meiryo",
-            
-            # 韩语字体
-            "batang": "Batang",
-            "gulim": "Gulim",
-            "malgun gothic": "Malgun Gothic",
-            "malgun": "Malgun Gothic",
-        }
-        
-        # 检查是否有直接匹配
-        pdf_font_lower = pdf_font_name.lower().strip()
-        
-        # 1. 先尝试完全匹配
-        if pdf_font_lower in font_map:
-            return font_map[pdf_font_lower]
-        
-        # 2. 部分匹配
-        for key, value in font_map.items():
-            if key in pdf_font_lower:
-                return value
-        
-        # 3. 智能匹配 - 检查常见字体样式词汇
-        is_serif = any(x in pdf_font_lower for x in ["serif", "roman", "times", "ming", "song", "宋"])
-        is_sans = any(x in pdf_font_lower for x in ["sans", "arial", "helvetica", "gothic", "hei", "黑"])
-        is_mono = any(x in pdf_font_lower for x in ["mono", "courier", "typewriter", "console"])
-        
-        if is_serif:
-            return "Times New Roman"
-        elif is_sans:
-            return "Arial"
-        elif is_mono:
-            return "Courier New"
-        
-        # 默认返回通用字体
-        return "Arial"
+        return _map_font_cached(pdf_font_name)
     
         """
         分别处理页面元素，支持表格和图像的精确识别
@@ -663,14 +1454,14 @@ class EnhancedPDFConverter:
         """
         try:
             # 获取页面内容
-            page_dict = page.get_text("dict", sort=True)
-            blocks = page_dict["blocks"]
+            page_dict = self._page_dict(page)
+            blocks = list(page_dict["blocks"])
             
             # 预处理块，标记表格区域
             blocks = self._mark_table_regions(blocks, tables)
             
             # 按y0坐标排序块，以保持垂直阅读顺序
-            blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+            blocks.sort(key=_block_position_key)
             
             # 依次处理每个块
             current_y = -1
@@ -731,104 +1522,6 @@ class EnhancedPDFConverter:
             traceback.print_exc()
             # 如果处理元素失败，回退到较安全的页面处理方法
             self._process_complex_page_by_elements(doc, page, pdf_document, tables)
-    def _detect_paragraph_format(self, block, page_width):
-        """
-        检测文本块的段落格式（对齐方式和缩进）
-        
-        参数:
-            block: 文本块
-            page_width: 页面宽度
-            
-        返回:
-            tuple: (alignment, left_indent) - 对齐方式和左缩进值
-        """
-        # 获取块的边界框
-        bbox = block["bbox"]
-        left = bbox[0]
-        right = bbox[2]
-        width = right - left
-        
-        # 获取块中所有的行
-        lines = block.get("lines", [])
-        if not lines:
-            return WD_ALIGN_PARAGRAPH.LEFT, 0
-        
-        # 收集所有行的左右边界
-        line_lefts = []
-        line_rights = []
-        line_widths = []
-        
-        for line in lines:
-            line_bbox = line["bbox"]
-            line_left = line_bbox[0]
-            line_right = line_bbox[2]
-            line_width = line_right - line_left
-            
-            line_lefts.append(line_left)
-            line_rights.append(line_right)
-            line_widths.append(line_width)
-        
-        # 计算平均值
-        avg_left = sum(line_lefts) / len(line_lefts)
-        avg_right = sum(line_rights) / len(line_rights)
-        avg_width = sum(line_widths) / len(line_widths)
-        
-        # 页面中央位置
-        page_center = page_width / 2
-        
-        # 计算文本块中心点
-        block_center = (avg_left + avg_right) / 2
-        
-        # 检测左缩进
-        left_indent = 0
-        if avg_left > 20:  # 如果左边距大于20点，认为有缩进
-            left_indent = avg_left
-        
-        # 检查是否为居中对齐
-        center_tolerance = page_width * 0.1  # 10%的页面宽度作为容差
-        if abs(block_center - page_center) < center_tolerance:
-            # 额外检查：如果文本宽度很小（相对于页面），更可能是居中的
-            if avg_width < page_width * 0.7:  # 文本宽度小于页面宽度的70%
-                return WD_ALIGN_PARAGRAPH.CENTER, 0
-        
-        # 检查是否为右对齐
-        right_margin = page_width - avg_right
-        if right_margin < 50 and avg_left > 100:  # 右边距小，左边距大
-            return WD_ALIGN_PARAGRAPH.RIGHT, 0
-        
-        # 检查是否为两端对齐（判断标准：多行文本，且最后一行明显短于其他行）
-        if len(lines) > 1:
-            # 获取除最后一行外的所有行宽度
-            other_line_widths = line_widths[:-1]
-            if other_line_widths:
-                avg_other_width = sum(other_line_widths) / len(other_line_widths)
-                last_line_width = line_widths[-1]
-                
-                # 如果最后一行明显短于其他行（小于80%），可能是两端对齐
-                if last_line_width < avg_other_width * 0.8 and avg_width > page_width * 0.7:
-                    return WD_ALIGN_PARAGRAPH.JUSTIFY, left_indent
-        
-        # 检查是否有特殊的段落样式标记
-        try:
-            spans = []
-            for line in lines:
-                for span in line.get("spans", []):
-                    spans.append(span)
-            
-            # 检查是否包含居中的标题特征（粗体、大字体等）
-            if spans:
-                first_span = spans[0]
-                font_size = first_span.get("size", 0)
-                font_flags = first_span.get("flags", 0)
-                
-                # 粗体 (0x1)、大字体 (> 12)、居中位置，很可能是标题
-                if (font_flags & 0x1) and font_size > 12 and abs(block_center - page_center) < center_tolerance:
-                    return WD_ALIGN_PARAGRAPH.CENTER, 0
-        except Exception as e:
-            print(f"分析段落样式时出错: {e}")
-        
-        # 默认为左对齐，返回检测到的左缩进
-        return WD_ALIGN_PARAGRAPH.LEFT, left_indent
     def _is_new_paragraph_by_indent(self, block, current_paragraph):
         """
         通过缩进判断是否需要新段落
@@ -862,19 +1555,19 @@ class EnhancedPDFConverter:
             
             # 获取当前段落的最后一个运行对象的内容和属性
             try:
-                paragraph_content = current_paragraph.text
+                # 只需检查段落末尾，去除尾部空白一次即可
+                paragraph_content = self._paragraph_text(current_paragraph).rstrip()
                 
                 # 如果段落为空，则认为需要新段落
-                if not paragraph_content.strip():
+                if not paragraph_content:
                     return True
                 
                 # 检查段落末尾是否有结束标志
-                if paragraph_content.rstrip().endswith(('.', '!', '?', ':', ';', '。', '！', '？', '：', '；')):
+                if paragraph_content[-1] in _PARA_END_CHARS:
                     return True
                 
-                # 检查段落是否以不完整的单词结束（可能是断行）
-                words = paragraph_content.split()
-                if words and len(words[-1]) <= 2:  # 短词可能是断词
+                # 检查段落是否以不完整的单词结束（可能是断行），只从右侧切出最后一个单词
+                if len(paragraph_content.rsplit(None, 1)[-1]) <= 2:  # 短词可能是断词
                     return False  # 可能是同一段落的延续
                 
                 # 检查缩进差异
@@ -898,7 +1591,7 @@ class EnhancedPDFConverter:
                     
                 # 检查段落最后一行是否已满（如果不满，可能是段落中间断行）
                 # 这是一个启发式规则：如果段落的最后一行很短，可能是新段落的开始
-                if len(paragraph_content.rstrip()) < 50:  # 假设少于50个字符表示行未满
+                if len(paragraph_content) < 50:  # 假设少于50个字符表示行未满
                     # 检查当前块是否有明显的缩进
                     if first_line_x > 20:  # 有明显缩进
                         return True
@@ -906,133 +1599,30 @@ class EnhancedPDFConverter:
                 # 如果无法分析段落内容，使用简单规则
                 pass
                 
-            # 分析当前块的文本风格
-            spans = []
+            # 分析当前块的文本风格：一次遍历所有span，同时检查格式标记和第一个字符
+            first_char = None
             for line in lines:
-                for span in line.get("spans", []):
-                    spans.append(span)
-                    
-            # 如果块中有特殊的格式标记（如粗体、斜体等），可能是新段落的开始
-            if spans and any(span.get("flags", 0) > 0 for span in spans):
-                return True
-                
-            # 检查块的第一个字符是否为首字母大写（英文）或中文段落开始的标志
-            first_chars = []
-            for span in spans:
-                if span.get("text"):
-                    first_chars.append(span["text"][0])
-                    break
+                for span in line.get("spans", ()):
+                    # 如果块中有特殊的格式标记（如粗体、斜体等），可能是新段落的开始
+                    if span.get("flags", 0) > 0:
+                        return True
+                    if first_char is None:
+                        text = span.get("text")
+                        if text:
+                            first_char = text[0]
                     
-            if first_chars and any(c.isupper() for c in first_chars):
-                # 首字母大写可能表示新段落（英文）
-                return True
-                
-        except Exception as e:
-            print(f"分析段落缩进时出错: {e}")
-            return True  # 出错时保守处理，创建新段落
-        
-        # 默认情况下，如果无法明确判断，则不创建新段落
-        return False
-    
-    def _detect_paragraph_format(self, block, page_width):
-        """
-        检测文本块的段落格式（对齐方式和缩进）
-        
-        参数:
-            block: 文本块
-            page_width: 页面宽度
-            
-        返回:
-            tuple: (alignment, left_indent) - 对齐方式和左缩进值
-        """
-        # 获取块的边界框
-        bbox = block["bbox"]
-        left = bbox[0]
-        right = bbox[2]
-        width = right - left
-        
-        # 获取块中所有的行
-        lines = block.get("lines", [])
-        if not lines:
-            return WD_ALIGN_PARAGRAPH.LEFT, 0
-        
-        # 收集所有行的左右边界
-        line_lefts = []
-        line_rights = []
-        line_widths = []
-        
-        for line in lines:
-            line_bbox = line["bbox"]
-            line_left = line_bbox[0]
-            line_right = line_bbox[2]
-            line_width = line_right - line_left
-            
-            line_lefts.append(line_left)
-            line_rights.append(line_right)
-            line_widths.append(line_width)
-        
-        # 计算平均值
-        avg_left = sum(line_lefts) / len(line_lefts)
-        avg_right = sum(line_rights) / len(line_rights)
-        avg_width = sum(line_widths) / len(line_widths)
-        
-        # 页面中央位置
-        page_center = page_width / 2
-        
-        # 计算文本块中心点
-        block_center = (avg_left + avg_right) / 2
-        
-        # 检测左缩进
-        left_indent = 0
-        if avg_left > 20:  # 如果左边距大于20点，认为有缩进
-            left_indent = avg_left
-        
-        # 检查是否为居中对齐
-        center_tolerance = page_width * 0.1  # 10%的页面宽度作为容差
-        if abs(block_center - page_center) < center_tolerance:
-            # 额外检查：如果文本宽度很小（相对于页面），更可能是居中的
-            if avg_width < page_width * 0.7:  # 文本宽度小于页面宽度的70%
-                return WD_ALIGN_PARAGRAPH.CENTER, 0
-        
-        # 检查是否为右对齐
-        right_margin = page_width - avg_right
-        if right_margin < 50 and avg_left > 100:  # 右边距小，左边距大
-            return WD_ALIGN_PARAGRAPH.RIGHT, 0
-        
-        # 检查是否为两端对齐（判断标准：多行文本，且最后一行明显短于其他行）
-        if len(lines) > 1:
-            # 获取除最后一行外的所有行宽度
-            other_line_widths = line_widths[:-1]
-            if other_line_widths:
-                avg_other_width = sum(other_line_widths) / len(other_line_widths)
-                last_line_width = line_widths[-1]
-                
-                # 如果最后一行明显短于其他行（小于80%），可能是两端对齐
-                if last_line_width < avg_other_width * 0.8 and avg_width > page_width * 0.7:
-                    return WD_ALIGN_PARAGRAPH.JUSTIFY, left_indent
-        
-        # 检查是否有特殊的段落样式标记
-        try:
-            spans = []
-            for line in lines:
-                for span in line.get("spans", []):
-                    spans.append(span)
-            
-            # 检查是否包含居中的标题特征（粗体、大字体等）
-            if spans:
-                first_span = spans[0]
-                font_size = first_span.get("size", 0)
-                font_flags = first_span.get("flags", 0)
+            # 检查块的第一个字符是否为首字母大写（英文）或中文段落开始的标志
+            if first_char is not None and first_char.isupper():
+                # 首字母大写可能表示新段落（英文）
+                return True
                 
-                # 粗体 (0x1)、大字体 (> 12)、居中位置，很可能是标题
-                if (font_flags & 0x1) and font_size > 12 and abs(block_center - page_center) < center_tolerance:
-                    return WD_ALIGN_PARAGRAPH.CENTER, 0
         except Exception as e:
-            print(f"分析段落样式时出错: {e}")
+            print(f"分析段落缩进时出错: {e}")
+            return True  # 出错时保守处理，创建新段落
         
-        # 默认为左对齐，返回检测到的左缩进
-        return WD_ALIGN_PARAGRAPH.LEFT, left_indent
-
+        # 默认情况下，如果无法明确判断，则不创建新段落
+        return False
+    
     def _init_advanced_table_fixes(self):
         """初始化高级表格修复功能"""
         try:
@@ -1093,19 +1683,14 @@ class EnhancedPDFConverter:
             
             # 4. 获取行间距信息以检测真正的段落分隔
             lines = block["lines"]
-            y_positions = [(i, line["bbox"][1], line["bbox"][3]) for i, line in enumerate(lines)]
-            avg_line_height = 0
-            line_gaps = []
-            
-            if len(lines) > 1:
-                for i in range(len(lines) - 1):
-                    curr_bottom = lines[i]["bbox"][3]
-                    next_top = lines[i+1]["bbox"][1]
-                    gap = next_top - curr_bottom
-                    line_gaps.append(gap)
-                
-                if line_gaps:
-                    avg_line_height = sum(line_gaps) / len(line_gaps)
+            line_gaps = [lines[i + 1]["bbox"][1] - lines[i]["bbox"][3] for i in range(len(lines) - 1)]
+            avg_line_height = sum(line_gaps) / len(line_gaps) if line_gaps else 0
+            
+            # 一次性判断每两行之间是否需要分段：间距大于平均行高的1.8倍时创建新段落
+            new_paragraph_after = [avg_line_height > 0 and gap > avg_line_height * 1.8 for gap in line_gaps]
+            
+            # 记录段落中最后一个文本运行，避免每行都通过paragraph.runs重建全部运行列表
+            last_run = paragraph.runs[-1] if paragraph.runs else None
             
             # 5. 智能处理每一行文本
             for i, line in enumerate(lines):
@@ -1114,43 +1699,39 @@ class EnhancedPDFConverter:
                 if not line_spans:
                     # 如果没有spans，添加空行
                     if i < len(lines) - 1:  # 不是最后一行
-                        if paragraph.runs:
-                            paragraph.runs[-1].add_break()
+                        if last_run is not None:
+                            last_run.add_break()
                     continue
                 
-                # 添加该行文本，保留格式
-                for span in line_spans:
-                    text = span.get("text", "")
-                    if not text:
-                        continue
+                # 添加该行文本，保留格式：相邻且样式相同的span(PDF常因字距调整拆分)合并为一个文本运行
+                text_spans = [span for span in line_spans if span.get("text", "")]
+                for _, style_group in groupby(text_spans, key=_span_style_key):
+                    style_group = list(style_group)
                     
                     # 创建带格式的文本运行
-                    run = paragraph.add_run(text)
+                    last_run = paragraph.add_run("".join(span["text"] for span in style_group))
                     
                     # 应用字体样式 - 增强版字体映射和处理
-                    self._apply_font_style_to_run(run, span, default_font, default_size)
+                    self._apply_font_style_to_run(last_run, style_group[0], default_font, default_size)
                 
                 # 判断是否需要添加换行或新段落
                 if i < len(lines) - 1:  # 不是最后一行
-                    # 如果两行之间的间距大于平均行高的1.8倍，创建新段落
-                    curr_bottom = line["bbox"][3]
-                    next_top = lines[i+1]["bbox"][1]
-                    line_gap = next_top - curr_bottom
-                    
-                    if avg_line_height > 0 and line_gap > avg_line_height * 1.8:
+                    if new_paragraph_after[i]:
                         # 创建新段落
                         paragraph = paragraph._parent.add_paragraph()
                         paragraph.alignment = align
                         if left_indent > 0:
                             paragraph.paragraph_format.left_indent = Pt(left_indent * 0.35)
+                        last_run = None
                     else:
                         # 在同一段落内添加换行符
-                        if paragraph.runs:
-                            paragraph.runs[-1].add_break()
+                        if last_run is not None:
+                            last_run.add_break()
         
         except Exception as e:
             print(f"精确换行处理时出错: {e}")
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             
             # 回退到简单文本处理
             try:
@@ -1187,34 +1768,38 @@ class EnhancedPDFConverter:
         返回:
             字体统计信息字典
         """
-        fonts = []
-        sizes = []
-        is_bold = []
-        is_italic = []
+        # 字体名称直接计数，大小和样式累加为计数，不再为每个span构建中间列表
+        font_counter = Counter()
+        size_sum = 0.0
+        size_n = 0
+        bold_n = 0
+        italic_n = 0
+        flag_n = 0
         
         # 收集所有字体信息
-        if "lines" in block:
-            for line in block["lines"]:
-                if "spans" in line:
-                    for span in line["spans"]:
-                        # 收集字体名称
-                        font_name = span.get("font", "")
-                        if font_name:
-                            # 清理字体名称，移除常见后缀
-                            clean_font = font_name.split('+')[-1]  # 处理'Arial+Italic'这种情况
-                            clean_font = re.sub(r',.*$', '', clean_font)  # 移除逗号后内容
-                            fonts.append(clean_font)
-                        
-                        # 收集字体大小
-                        font_size = span.get("size", 0)
-                        if font_size > 0:
-                            sizes.append(font_size)
-                        
-                        # 收集字体样式
-                        flags = span.get("flags", 0)
-                        if flags:
-                            is_bold.append(bool(flags & 0x1))  # 粗体
-                            is_italic.append(bool(flags & 0x2))  # 斜体
+        for line in block.get("lines", ()):
+            for span in line.get("spans", ()):
+                # 收集字体名称
+                font_name = span.get("font", "")
+                if font_name:
+                    # 清理字体名称：处理'Arial+Italic'这种情况，并移除逗号后内容
+                    clean_font = _FONT_SUFFIX_RE.sub('', font_name.rpartition('+')[2])
+                    font_counter[clean_font] += 1
+                
+                # 收集字体大小
+                font_size = span.get("size", 0)
+                if font_size > 0:
+                    size_sum += font_size
+                    size_n += 1
+                
+                # 收集字体样式
+                flags = span.get("flags", 0)
+                if flags:
+                    flag_n += 1
+                    if flags & 0x1:  # 粗体
+                        bold_n += 1
+                    if flags & 0x2:  # 斜体
+                        italic_n += 1
         
         # 分析结果
         result = {
@@ -1225,23 +1810,17 @@ class EnhancedPDFConverter:
         }
         
         # 找出最常用的字体
-        if fonts:
-            from collections import Counter
-            font_counter = Counter(fonts)
-            most_common = font_counter.most_common(1)
-            if most_common:
-                result["default_font"] = most_common[0][0]
+        if font_counter:
+            result["default_font"] = font_counter.most_common(1)[0][0]
         
         # 计算平均字体大小
-        if sizes:
-            result["default_size"] = sum(sizes) / len(sizes)
+        if size_n:
+            result["default_size"] = size_sum / size_n
         
         # 检查是否大多数是粗体或斜体
-        if is_bold:
-            result["is_mostly_bold"] = sum(is_bold) > len(is_bold) / 2
-        
-        if is_italic:
-            result["is_mostly_italic"] = sum(is_italic) > len(is_italic) / 2
+        if flag_n:
+            result["is_mostly_bold"] = bold_n > flag_n / 2
+            result["is_mostly_italic"] = italic_n > flag_n / 2
         
         return result
 
@@ -1261,12 +1840,16 @@ class EnhancedPDFConverter:
             # 1. 应用字体名称
             font_name = span.get("font", "")
             if font_name:
-                # 清理和映射字体名称
-                clean_font = font_name.split('+')[-1]  # 处理复合字体名
-                clean_font = re.sub(r',.*$', '', clean_font)  # 移除后缀
-                
-                # 映射字体到Word支持的字体
-                mapped_font = self._map_font(clean_font)
+                # 映射结果随字体替换质量变化，缓存键包含质量设置
+                font_key = (font_name, self.font_substitution_quality)
+                mapped_font = self._font_cache.get(font_key)
+                if mapped_font is None:
+                    # 清理字体名称：处理复合字体名并移除后缀
+                    clean_font = _FONT_SUFFIX_RE.sub('', font_name.rpartition('+')[2])
+                    
+                    # 映射字体到Word支持的字体
+                    mapped_font = self._map_font(clean_font)
+                    self._font_cache[font_key] = mapped_font
                 run.font.name = mapped_font
             else:
                 run.font.name = default_font
@@ -1276,9 +1859,9 @@ class EnhancedPDFConverter:
             if font_size > 0:
                 # 确保字体大小在合理范围内
                 font_size = min(max(font_size, 5), 72)  # 限制在5-72点之间
-                run.font.size = Pt(font_size)
+                run.font.size = _cached_font_size(font_size)
             else:
-                run.font.size = Pt(default_size)
+                run.font.size = _cached_font_size(default_size)
             
             # 3. 应用字体样式 - 粗体、斜体、下划线
             flags = span.get("flags", 0)
@@ -1290,39 +1873,9 @@ class EnhancedPDFConverter:
             # 4. 应用颜色 - 增强版颜色处理
             color = span.get("color", "")
             if color:
-                if isinstance(color, str) and len(color) == 6:
-                    try:
-                        r = int(color[0:2], 16)
-                        g = int(color[2:4], 16)
-                        b = int(color[4:6], 16)
-                        run.font.color.rgb = RGBColor(r, g, b)
-                    except ValueError:
-                        # 如果十六进制转换失败，使用默认黑色
-                        run.font.color.rgb = RGBColor(0, 0, 0)
-                elif isinstance(color, (list, tuple)) and len(color) >= 3:
-                    try:
-                        r = int(color[0])
-                        g = int(color[1])
-                        b = int(color[2])
-                        # 确保RGB值在0-255范围内
-                        r = min(max(r, 0), 255)
-                        g = min(max(g, 0), 255) 
-                        b = min(max(b, 0), 255)
-                        run.font.color.rgb = RGBColor(r, g, b)
-                    except (ValueError, TypeError):
-                        # 如果转换失败，使用默认黑色
-                        run.font.color.rgb = RGBColor(0, 0, 0)
-                
-                # 特殊处理接近黑色的颜色
-                try:
-                    if hasattr(run.font.color, 'rgb') and run.font.color.rgb:
-                        rgb = run.font.color.rgb
-                        if rgb.r < 30 and rgb.g < 30 and rgb.b < 30:
-                            # 近黑色统一处理为纯黑
-                            run.font.color.rgb = RGBColor(0, 0, 0)
-                except AttributeError:
-                    # 如果run.font.color.rgb是None，设置为黑色
-                    run.font.color.rgb = RGBColor(0, 0, 0)
+                rgb = self._span_rgb_color(color)
+                if rgb is not None:
+                    run.font.color.rgb = rgb
         
         except Exception as e:
             print(f"应用字体样式时出错: {e}")
@@ -1335,6 +1888,45 @@ class EnhancedPDFConverter:
             except:
                 pass
 
+
+    def _span_rgb_color(self, color):
+        """
+        将span的颜色值解析为RGBColor，结果按原始颜色值缓存
+        
+        参数:
+            color: 十六进制字符串("RRGGBB")或RGB序列
+            
+        返回:
+            RGBColor对象，无法识别的颜色格式返回None
+        """
+        key = tuple(color) if isinstance(color, list) else color
+        if key in self._color_cache:
+            return self._color_cache[key]
+        
+        rgb = None
+        if isinstance(color, str) and len(color) == 6:
+            try:
+                rgb = RGBColor(int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16))
+            except ValueError:
+                # 如果十六进制转换失败，使用默认黑色
+                rgb = RGBColor(0, 0, 0)
+        elif isinstance(color, (list, tuple)) and len(color) >= 3:
+            try:
+                # 确保RGB值在0-255范围内
+                r = min(max(int(color[0]), 0), 255)
+                g = min(max(int(color[1]), 0), 255)
+                b = min(max(int(color[2]), 0), 255)
+                rgb = RGBColor(r, g, b)
+            except (ValueError, TypeError):
+                # 如果转换失败，使用默认黑色
+                rgb = RGBColor(0, 0, 0)
+        
+        # 特殊处理接近黑色的颜色：近黑色统一处理为纯黑
+        if rgb is not None and rgb[0] < 30 and rgb[1] < 30 and rgb[2] < 30:
+            rgb = RGBColor(0, 0, 0)
+        
+        self._color_cache[key] = rgb
+        return rgb
     
     def _process_text_block_enhanced(self, paragraph, block):
         """
@@ -1469,7 +2061,7 @@ class EnhancedPDFConverter:
                     else:
                         # 尝试使用PyMuPDF的内置方法（可能不存在）
                         try:
-                            tables = page.find_tables()
+                            tables = self._find_tables_cached(page)
                             if tables and len(tables.tables) > 0:
                                 tables_by_page[page_num] = tables.tables
                         except AttributeError:
@@ -1481,6 +2073,10 @@ class EnhancedPDFConverter:
                                     tables_by_page[page_num] = tables
                 except Exception as table_err:
                     print(f"表格检测警告 (页 {page_num+1}): {table_err}")
+                
+                # 检测到的表格(含其所属页面)保留到正文处理，页面上的检测缓存在此释放，
+                # 避免整个文档的TableFinder和文本字典同时驻留内存
+                self._release_page_caches(page)
             
             # 检测是否有多列布局的页面
             multi_column_pages = self._detect_multi_column_pages(pdf_document)
@@ -1490,8 +2086,8 @@ class EnhancedPDFConverter:
                 page = pdf_document[page_num]
                 
                 # 分析页面布局
-                page_dict = page.get_text("dict", sort=True)  # 使用sort=True确保按阅读顺序
-                blocks = page_dict["blocks"]
+                page_dict = self._page_dict(page)  # 按阅读顺序排序
+                blocks = list(page_dict["blocks"])
                 
                 # 预处理块，标记表格区域
                 blocks = self._mark_table_regions(blocks, tables_by_page.get(page_num, []))
@@ -1573,9 +2169,10 @@ class EnhancedPDFConverter:
                 else:
                     # 对于单列布局，按常规方式处理
                     # 按y0坐标排序块，以保持垂直阅读顺序
-                    blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+                    blocks.sort(key=_block_position_key)
                     current_y = -1
                     current_paragraph = None
+                    page_width = page.rect.width
                     for block in blocks:
                         if block.get("is_table", False):
                             self._process_table_block(doc, block, page, pdf_document)
@@ -1588,6 +2185,8 @@ class EnhancedPDFConverter:
                             current_y = -1
                             continue
                         if block["type"] == 0:
+                            # 记录实际页面宽度，文本处理时据此复用已检测的段落格式
+                            block["page_width"] = page_width
                             block_y = block["bbox"][1]
                             new_paragraph_needed = (current_y == -1 or 
                                                    (abs(block_y - current_y) > 12) or  
@@ -1596,7 +2195,7 @@ class EnhancedPDFConverter:
                                 current_paragraph = doc.add_paragraph()
                                 current_y = block_y
                                 try:
-                                    format_result = self._detect_paragraph_format(block, page.rect.width)
+                                    format_result = self._detect_paragraph_format(block, page_width)
                                     if isinstance(format_result, tuple) and len(format_result) == 2:
                                         alignment, left_indent = format_result
                                     else:
@@ -1624,7 +2223,7 @@ class EnhancedPDFConverter:
             output_path = os.path.join(self.output_dir, output_filename)
             
             # 保存Word文档
-            doc.save(output_path)
+            _save_docx(doc, output_path)
             
             print(f"成功将PDF转换为Word: {output_path}")            
             return output_path
@@ -1698,7 +2297,7 @@ class EnhancedPDFConverter:
                     if hasattr(self, 'detect_tables_advanced'):
                         detected_tables = self.detect_tables_advanced(page)
                     elif hasattr(page, 'find_tables'):
-                        detected_tables = page.find_tables()
+                        detected_tables = self._find_tables_cached(page)
                     elif hasattr(self, '_extract_tables'):
                         detected_tables = self._extract_tables(pdf_document, page_num)
                     
@@ -1725,6 +2324,10 @@ class EnhancedPDFConverter:
                             merged_cells_by_page[page_num] = merged_cells
                 except Exception as e:
                     print(f"表格检测警告 (页 {page_num+1}): {e}")
+                
+                # 检测到的表格(含其所属页面)保留到正文处理，页面上的检测缓存在此释放，
+                # 避免整个文档的TableFinder和文本字典同时驻留内存
+                self._release_page_caches(page)
             
             # 检测多列布局
             multi_column_pages = {}
@@ -1741,8 +2344,8 @@ class EnhancedPDFConverter:
                 page = pdf_document[page_num]
                 try:
                     # 获取页面文本
-                    page_dict = page.get_text("dict", sort=True)
-                    blocks = page_dict.get("blocks", [])
+                    page_dict = self._page_dict(page)
+                    blocks = list(page_dict.get("blocks", []))
                     
                     # 分析块样式
                     paragraph_styles = []
@@ -1816,7 +2419,7 @@ class EnhancedPDFConverter:
                     else:
                         # 简化版复杂页面检测
                         images = page.get_images(full=False)
-                        text_dict = page.get_text("dict")
+                        text_dict = self._page_dict(page)
                         blocks = text_dict.get("blocks", [])
                         # 判断页面复杂度: 图像数量多或文本块多
                         is_complex = len(images) > 2 or len(blocks) > 20
@@ -1858,7 +2461,7 @@ class EnhancedPDFConverter:
             output_path = os.path.join(self.output_dir, output_filename)
             
             # 保存Word文档
-            doc.save(output_path)
+            _save_docx(doc, output_path)
             
             print(f"成功将PDF转换为Word(混合模式): {output_path}")
             return output_path
@@ -1883,14 +2486,14 @@ class EnhancedPDFConverter:
         """
         try:
             # 获取页面内容
-            page_dict = page.get_text("dict", sort=True)
-            blocks = page_dict["blocks"]
+            page_dict = self._page_dict(page)
+            blocks = list(page_dict["blocks"])
             
             # 预处理块，标记表格区域
             blocks = self._mark_table_regions(blocks, tables)
             
             # 按y0坐标排序块，以保持垂直阅读顺序
-            blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+            blocks.sort(key=_block_position_key)
             
             # 依次处理每个块
             current_y = -1
@@ -1898,6 +2501,7 @@ class EnhancedPDFConverter:
             previous_block_bottom = None
             last_indent = 0
             
+            page_width = page.rect.width
             for block in blocks:
                 # 处理表格 - 使用高级表格处理函数
                 if block.get("is_table", False):
@@ -1917,6 +2521,8 @@ class EnhancedPDFConverter:
                 
                 # 处理文本
                 if block["type"] == 0:
+                    # 记录实际页面宽度，文本处理时据此复用已检测的段落格式
+                    block["page_width"] = page_width
                     block_y = block["bbox"][1]
                     block_bottom = block["bbox"][3]
                     
@@ -1953,7 +2559,7 @@ class EnhancedPDFConverter:
                         
                         # 设置段落格式
                         try:
-                            format_result = self._detect_paragraph_format(block, page.rect.width)
+                            format_result = self._detect_paragraph_format(block, page_width)
                             if isinstance(format_result, tuple) and len(format_result) == 2:
                                 alignment, left_indent = format_result
                             else:
@@ -2146,16 +2752,16 @@ class EnhancedPDFConverter:
                     # 调整表格宽度以适应页面
                     try:
                         # 获取可用宽度
-                        section = doc.sections[0]
-                        available_width = section.page_width.inches - section.left_margin.inches - section.right_margin.inches - 0.1
+                        page_width, left_margin, right_margin = self._doc_page_geometry(doc)
+                        available_width = page_width - left_margin - right_margin - 0.1
                         
                         # 设置表格宽度
                         table.width = Inches(available_width)
                         
                         # 调整列宽 - 均匀分配
-                        col_width = available_width / len(table.columns)
+                        col_width = Inches(available_width / len(table.columns))
                         for col in table.columns:
-                            col.width = Inches(col_width)
+                            col.width = col_width
                     except Exception as width_err:
                         print(f"调整表格宽度时出错: {width_err}")
         
@@ -2179,14 +2785,14 @@ class EnhancedPDFConverter:
         """
         try:
             # 获取页面内容
-            page_dict = page.get_text("dict", sort=True)
-            blocks = page_dict["blocks"]
+            page_dict = self._page_dict(page)
+            blocks = list(page_dict["blocks"])
             
             # 预处理块，标记表格区域
             blocks = self._mark_table_regions(blocks, tables)
             
             # 按y0坐标排序块，以保持垂直阅读顺序
-            blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+            blocks.sort(key=_block_position_key)
             
             # 依次处理每个块
             current_y = -1
@@ -2306,38 +2912,35 @@ class EnhancedPDFConverter:
             
             # 如果找不到表格数据，尝试从页面提取
             if not table_data:
-                # 获取表格区域的图像
-                clip_rect = fitz.Rect(table_rect)
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), clip=clip_rect)
-                
-                # 保存为临时图像文件
-                img_path = os.path.join(self.temp_dir, f"table_img_{page.number}_{hash(str(table_rect))}.png")
-                pix.save(img_path)
-                
-                # 尝试使用OCR或其他方法分析表格结构
-                if hasattr(self, '_analyze_table_structure'):
-                    try:
-                        rows_data, merged_cells = self._analyze_table_structure(img_path)
-                    except Exception as analyze_err:
-                        print(f"表格结构分析失败: {analyze_err}")
-                        rows_data = []
-                else:
-                    # 如果没有分析方法，尝试基本表格结构检测
-                    try:
-                        if hasattr(self, '_detect_basic_table_structure'):
+                # 先按文本坐标提取(代价远低于渲染图像后分析)，得到至少2行2列时直接使用
+                rows_data = self._extract_table_data_from_text(page, table_rect)
+                text_table_ok = len(rows_data) >= 2 and max(map(len, rows_data)) >= 2
+                
+                if not text_table_ok and (hasattr(self, '_analyze_table_structure') or
+                                          hasattr(self, '_detect_basic_table_structure')):
+                    # 获取表格区域的图像
+                    img_path = self._table_region_image(page, table_rect)
+                    
+                    # 尝试使用OCR或其他方法分析表格结构
+                    if hasattr(self, '_analyze_table_structure'):
+                        try:
+                            rows_data, merged_cells = self._analyze_table_structure(img_path)
+                        except Exception as analyze_err:
+                            print(f"表格结构分析失败: {analyze_err}")
+                            rows_data = []
+                    else:
+                        # 如果没有分析方法，尝试基本表格结构检测
+                        try:
                             rows_data, merged_cells = self._detect_basic_table_structure(img_path)
-                        else:
-                            # 兜底方案：从页面文本中提取表格数据
-                            rows_data = self._extract_table_data_from_text(page, table_rect)
-                    except Exception as basic_err:
-                        print(f"基本表格结构检测失败: {basic_err}")
-                        rows_data = []
+                        except Exception as basic_err:
+                            print(f"基本表格结构检测失败: {basic_err}")
+                            rows_data = []
             
             # 创建Word表格
             if rows_data and len(rows_data) > 0:
                 # 确定行列数
                 num_rows = len(rows_data)
-                num_cols = max([len(row) for row in rows_data]) if rows_data else 0
+                num_cols = max(map(len, rows_data), default=0)
                 
                 if num_rows > 0 and num_cols > 0:
                     # 创建表格
@@ -2393,7 +2996,8 @@ class EnhancedPDFConverter:
             
         except Exception as e:
             print(f"处理表格时出错: {e}")
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             # 如果表格处理失败，回退到图像模式
             self._insert_table_as_image(doc, page, table_rect)
 
@@ -2407,18 +3011,13 @@ class EnhancedPDFConverter:
             table_rect: 表格区域
         """
         try:
-            # 获取表格区域的图像
-            clip_rect = fitz.Rect(table_rect)
-            matrix = fitz.Matrix(2, 2)  # 2x缩放以提高图像质量
-            pix = page.get_pixmap(matrix=matrix, clip=clip_rect)
-            
-            # 保存为临时图像文件
-            img_path = os.path.join(self.temp_dir, f"table_img_{page.number}_{hash(str(table_rect))}.png")
-            pix.save(img_path)
+            # 获取表格区域的图像(2x缩放以提高图像质量)
+            img_path = self._table_region_image(page, table_rect)
             
             # 计算图像宽度
             table_width = table_rect[2] - table_rect[0]
-            doc_width = doc.sections[0].page_width.inches - doc.sections[0].left_margin.inches - doc.sections[0].right_margin.inches
+            page_width, left_margin, right_margin = self._doc_page_geometry(doc)
+            doc_width = page_width - left_margin - right_margin
             
             # 计算图像最大宽度（英寸）
             max_width_inches = min(table_width / 72.0, doc_width - 0.1)
@@ -2443,49 +3042,28 @@ class EnhancedPDFConverter:
         try:
             # 检查是否有lines
             if "lines" in block:
-                for line in block["lines"]:
-                    # 处理每个spans
-                    if "spans" in line:
-                        for span in line["spans"]:
-                            # 提取文本内容
-                            text = span.get("text", "")
-                            if not text:
-                                continue
-                                
-                            # 创建文本运行
-                            run = paragraph.add_run(text)
-                            
-                            # 设置字体样式
-                            try:
-                                # 设置字体
-                                font_name = span.get("font", "")
-                                if font_name:
-                                    run.font.name = font_name
-                                
-                                # 设置字体大小
-                                font_size = span.get("size", 0)
-                                if font_size > 0:
-                                    run.font.size = Pt(font_size)
-                                
-                                # 设置粗体
-                                if span.get("bold", False):
-                                    run.font.bold = True
-                                    
-                                # 设置斜体
-                                if span.get("italic", False):
-                                    run.font.italic = True
-                                    
-                                # 设置下划线
-                                if span.get("underline", False):
-                                    run.font.underline = True
-                                    
-                                # 设置颜色
-                                color = span.get("color")
-                                if color and isinstance(color, list) and len(color) >= 3:
-                                    r, g, b = color[0], color[1], color[2]
-                                    run.font.color.rgb = RGBColor(r, g, b)
-                            except Exception as style_err:
-                                print(f"设置字体样式时出错: {style_err}")
+                spans = [span for line in block["lines"] if "spans" in line
+                         for span in line["spans"] if span.get("text", "")]
+                
+                # 相邻且样式相同的span合并为一个文本运行，样式只设置一次
+                p = paragraph._p
+                for style_key, group in groupby(spans, key=_styled_span_key):
+                    # 创建文本运行 - 直接添加<w:r>元素，不构造Run包装对象；
+                    # CT_R.text与add_run写入文本的规则相同(制表符、换行等)
+                    r = p.add_r()
+                    r.text = "".join(s["text"] for s in group)
+                    
+                    # 设置字体样式 - 复制同样式的<w:rPr>模板，一次挂到文本运行上
+                    try:
+                        rPr = _styled_run_properties(style_key)
+                        if rPr is not None:
+                            r.insert(0, deepcopy(rPr))
+                    except Exception:
+                        # 样式值无效时逐项设置，保留出错前已设置的样式
+                        try:
+                            _apply_styled_span_font(Run(r, paragraph), style_key)
+                        except Exception as style_err:
+                            print(f"设置字体样式时出错: {style_err}")
             else:
                 # 如果没有lines结构，直接添加文本
                 text = block.get("text", "")
@@ -2524,48 +3102,21 @@ class EnhancedPDFConverter:
             # 设置表格样式
             table.style = 'Table Grid'
             
+            # Table Grid样式本身已定义0.5磅单线边框，单线边框无需再逐个单元格写入
+            if _BORDER_VALUES.get(border_style, 'single') == 'single' and not getattr(self, 'override_grid_borders', False):
+                return
+            
+            # 所有单元格的边框相同，边框元素按样式只构建一次，再复制到各单元格
+            tcBorders = _table_borders_template(border_style)
+            
             # 设置所有单元格的边框
             for row in table.rows:
                 for cell in row.cells:
                     # 在python-docx中，单元格边框通过_element.get_or_add_tcPr()和XML元素设置
                     # 不能直接访问cell.border属性
                     
-                    # 获取单元格属性元素
-                    tcPr = cell._element.get_or_add_tcPr()
-                    
-                    # 创建边框元素
-                    tcBorders = OxmlElement('w:tcBorders')
-                    
-                    # 定义边框样式
-                    for border_position in ['top', 'bottom', 'left', 'right']:
-                        border = OxmlElement(f'w:{border_position}')
-                        
-                        # 设置边框类型
-                        if border_style == "single":
-                            border.set(qn('w:val'), 'single')
-                        elif border_style == "double":
-                            border.set(qn('w:val'), 'double')
-                        elif border_style == "dotted":
-                            border.set(qn('w:val'), 'dotted')
-                        elif border_style == "dashed":
-                            border.set(qn('w:val'), 'dashed')
-                        else:
-                            border.set(qn('w:val'), 'single')  # 默认为单线
-                        
-                        # 设置边框宽度
-                        border.set(qn('w:sz'), '4')  # 相当于0.5磅
-                        
-                        # 设置边框颜色
-                        border.set(qn('w:color'), '000000')  # 黑色边框
-                        
-                        # 设置边框间距（可选）
-                        border.set(qn('w:space'), '0')
-                        
-                        # 添加到边框容器
-                        tcBorders.append(border)
-                    
                     # 将边框添加到单元格属性
-                    tcPr.append(tcBorders)
+                    cell._element.get_or_add_tcPr().append(deepcopy(tcBorders))
         except Exception as e:
             print(f"应用表格边框时出错: {e}")  
     def _optimize_table_width(self, table, doc):
@@ -2578,9 +3129,8 @@ class EnhancedPDFConverter:
         """
         try:
             # 获取页面宽度
-            section = doc.sections[0]
-            page_width = section.page_width.inches
-            margins = section.left_margin.inches + section.right_margin.inches
+            page_width, left_margin, right_margin = self._doc_page_geometry(doc)
+            margins = left_margin + right_margin
             available_width = page_width - margins - 0.1  # 保留0.1英寸的边距
             
             # 设置表格宽度
@@ -2589,9 +3139,9 @@ class EnhancedPDFConverter:
             # 设置列宽平均分布
             col_count = len(table.columns)
             if col_count > 0:
-                col_width = available_width / col_count
+                col_width = Inches(available_width / col_count)
                 for col in table.columns:
-                    col.width = Inches(col_width)
+                    col.width = col_width
         except Exception as e:
             print(f"优化表格宽度时出错: {e}")
 
@@ -2643,21 +3193,15 @@ class EnhancedPDFConverter:
         返回:
             bool: 是否重叠
         """
-        # 转换为fitz.Rect对象，以便使用其内置方法
-        if not isinstance(rect1, fitz.Rect):
-            try:
-                rect1 = fitz.Rect(rect1)
-            except:
-                return False
-        
-        if not isinstance(rect2, fitz.Rect):
-            try:
-                rect2 = fitz.Rect(rect2)
-            except:
-                return False
+        # 直接比较坐标，不构造fitz.Rect；与fitz.Rect.intersects一致，空矩形不与任何矩形重叠
+        try:
+            ax0, ay0, ax1, ay1 = rect1[0], rect1[1], rect1[2], rect1[3]
+            bx0, by0, bx1, by1 = rect2[0], rect2[1], rect2[2], rect2[3]
+        except Exception:
+            return False
         
-        # 使用fitz.Rect的intersects方法
-        return rect1.intersects(rect2)
+        return (ax0 < ax1 and ay0 < ay1 and bx0 < bx1 and by0 < by1
+                and ax0 < bx1 and bx0 < ax1 and ay0 < by1 and by0 < ay1)
 
     def _extract_table_data_from_text(self, page, table_rect):
         """
@@ -2672,13 +3216,11 @@ class EnhancedPDFConverter:
         """
         try:
             # 获取表格区域的文本
-            clip_rect = fitz.Rect(table_rect)
-            table_text = page.get_text("dict", clip=clip_rect)
+            table_text = self._table_region_dict(page, table_rect)
             
             # 提取文本块
             if "blocks" in table_text:
-                blocks = table_text["blocks"]
-                blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+                blocks = sorted(table_text["blocks"], key=_block_position_key)
                 
                 # 按行组织数据
                 rows = []
@@ -2697,13 +3239,10 @@ class EnhancedPDFConverter:
                             current_y = block_y
                         
                         # 提取文本
-                        text = ""
-                        if "lines" in block:
-                            for line in block["lines"]:
-                                if "spans" in line:
-                                    for span in line["spans"]:
-                                        if "text" in span:
-                                            text += span["text"] + " "
+                        text = " ".join(span["text"]
+                                        for line in block.get("lines", ())
+                                        for span in line.get("spans", ())
+                                        if "text" in span)
                         
                         # 添加到当前行
                         current_row.append(text.strip())
@@ -2767,23 +3306,23 @@ class EnhancedPDFConverter:
             try:
                 # 提取表格内容
                 clip_rect = fitz.Rect(bbox)
-                table_text = page.get_text("dict", clip=clip_rect)
+                # 只用到文本块的左边界，按"blocks"格式提取，不构建逐行逐span的字典
+                table_blocks = page.get_text("blocks", clip=clip_rect, flags=_TABLE_TEXT_FLAGS)
                 
-                if "blocks" in table_text and table_text["blocks"]:
+                if table_blocks:
                     # 收集所有文本块的x坐标分布
                     x_positions = []
-                    for block in table_text["blocks"]:
-                        if block["type"] == 0:  # 文本块
-                            x_positions.append(block["bbox"][0])
+                    for block in table_blocks:
+                        if block[6] == 0:  # 文本块
+                            x_positions.append(block[0])
                     
                     # 如果有足够的数据点，尝试检测列边界
                     if len(x_positions) > 5:
                         x_positions.sort()
                         
                         # 使用聚类找出列分隔位置
-                        from collections import Counter
                         # 按接近度分组x坐标（四舍五入到5单位）
-                        x_groups = Counter([round(x / 5) * 5 for x in x_positions])
+                        x_groups = Counter(round(x / 5) * 5 for x in x_positions)
                         # 找出频率最高的几个x坐标，可能是列起始位置
                         common_x = [x for x, count in x_groups.most_common(10) if count > 2]
                         
@@ -2837,15 +3376,9 @@ class EnhancedPDFConverter:
             # 应用文本对齐方式
             alignment = style_info.get("alignment")
             if alignment:
+                para_alignment = _CELL_PARAGRAPH_ALIGNMENTS.get(alignment, WD_ALIGN_PARAGRAPH.LEFT)
                 for para in cell.paragraphs:
-                    if alignment == "center":
-                        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    elif alignment == "right":
-                        para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    elif alignment == "justify":
-                        para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                    else:
-                        para.alignment = WD_ALIGN_PARAGRAPH.LEFT
+                    para.alignment = para_alignment
             
             # 应用字体样式
             font_info = style_info.get("font")
@@ -2894,21 +3427,13 @@ class EnhancedPDFConverter:
                 
                 # 设置单元格阴影
                 shading_elm = cell._element.get_or_add_tcPr()
-                shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{bg_color_hex}"/>')
+                shading = _new_shading(bg_color_hex)
                 shading_elm.append(shading)
             
             # 应用垂直对齐方式
             vert_align = style_info.get("vertical_alignment")
-            if vert_align:
-                if vert_align == "top":
-                    cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.TOP
-                elif vert_align == "bottom":
-                    cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.BOTTOM
-                else:
-                    cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
-            else:
-                # 默认垂直居中
-                cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
+            # 未指定时默认垂直居中
+            cell.vertical_alignment = _CELL_VERTICAL_ALIGNMENTS.get(vert_align, WD_CELL_VERTICAL_ALIGNMENT.CENTER)
         
         except Exception as e:
             print(f"应用单元格样式时出错: {e}")
@@ -2934,18 +3459,11 @@ class EnhancedPDFConverter:
             
             # 添加底部边框强调
             tcPr = cell._element.get_or_add_tcPr()
-            tcBorders = OxmlElement('w:tcBorders')
-            bottomBorder = OxmlElement('w:bottom')
-            bottomBorder.set(qn('w:val'), 'single')
-            bottomBorder.set(qn('w:sz'), '12')  # 2磅线宽
-            bottomBorder.set(qn('w:space'), '0')
-            bottomBorder.set(qn('w:color'), '000000')
-            tcBorders.append(bottomBorder)
-            tcPr.append(tcBorders)
+            tcPr.append(deepcopy(_header_borders_template()))
             
             # 设置浅灰色背景
             shading_elm = cell._element.get_or_add_tcPr()
-            shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="F2F2F2"/>')
+            shading = _new_shading("F2F2F2")
             shading_elm.append(shading)
         
         except Exception as e:
@@ -2969,13 +3487,16 @@ class EnhancedPDFConverter:
             else:
                 color_hex = "f2f2f2"  # 默认浅灰色
             
-            # 为偶数行应用背景色
-            for i, row in enumerate(table.rows):
-                if i % 2 == 1:  # 偶数行 (索引从0开始，所以是i%2==1)
-                    for cell in row.cells:
-                        shading_elm = cell._element.get_or_add_tcPr()
-                        shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{color_hex}"/>')
-                        shading_elm.append(shading)
+            # 为偶数行应用背景色 (索引从0开始，所以取奇数索引的行)
+            # 直接遍历<w:tr>/<w:tc>，不构造python-docx的行/单元格对象；
+            # 与row.cells一致：纵向合并的续行单元格落到合并起始单元格，横向合并的单元格按跨列数重复
+            for tr in table._tbl.tr_lst[1::2]:
+                for tc in tr.tc_lst:
+                    while tc.vMerge == "continue":
+                        tc = tc._tc_above
+                    shading_elm = tc.get_or_add_tcPr()
+                    for _ in range(tc.grid_span):
+                        shading_elm.append(_new_shading(color_hex))
         
         except Exception as e:
             print(f"应用斑马纹样式时出错: {e}")
@@ -2989,114 +3510,50 @@ class EnhancedPDFConverter:
             html_text: 包含HTML标记的文本
         """
         try:
-            # 简单的HTML解析和格式化
+            # 简单的HTML解析和格式化: 按标签切分后依次处理文本片段和标签
             current_text = ""
-            is_bold = False
-            is_italic = False
-            is_underline = False
-            
-            i = 0
-            while i < len(html_text):
-                if html_text[i:i+3] == "<b>":
-                    # 如果有积累的文本，先添加现有文本
-                    if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        current_text = ""
-                    
-                    is_bold = True
-                    i += 3
-                elif html_text[i:i+4] == "</b>":
-                    # 如果有积累的文本，先添加现有文本
-                    if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        current_text = ""
-                    
-                    is_bold = False
-                    i += 4
-                elif html_text[i:i+3] == "<i>":
-                    # 如果有积累的文本，先添加现有文本
-                    if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        current_text = ""
-                    
-                    is_italic = True
-                    i += 3
-                elif html_text[i:i+4] == "</i>":
-                    # 如果有积累的文本，先添加现有文本
-                    if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        current_text = ""
-                    
-                    is_italic = False
-                    i += 4
-                elif html_text[i:i+3] == "<u>":
-                    # 如果有积累的文本，先添加现有文本
-                    if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        current_text = ""
-                    
-                    is_underline = True
-                    i += 3
-                elif html_text[i:i+4] == "</u>":
-                    # 如果有积累的文本，先添加现有文本
-                    if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        current_text = ""
-                    
-                    is_underline = False
-                    i += 4
-                elif html_text[i:i+4] == "<br>":
-                    # 如果有积累的文本，先添加现有文本
+            state = {"b": False, "i": False, "u": False}
+            
+            def flush():
+                run = paragraph.add_run(current_text)
+                run.bold = state["b"]
+                run.italic = state["i"]
+                run.underline = state["u"]
+                return run
+            
+            for index, part in enumerate(_HTML_TAG_RE.split(html_text)):
+                if index % 2 == 0:
+                    current_text += part
+                    continue
+                
+                if part == "<br>":
                     if current_text:
-                        run = paragraph.add_run(current_text)
-                        run.bold = is_bold
-                        run.italic = is_italic
-                        run.underline = is_underline
-                        run.add_break()
+                        flush().add_break()
                         current_text = ""
                     else:
                         # 如果没有文本，也添加一个换行
-                        run = paragraph.add_run()
-                        run.add_break()
-                    
-                    i += 4
-                elif html_text[i:i+1] == "<" and ">" in html_text[i:]:
+                        paragraph.add_run().add_break()
+                    continue
+                
+                toggle = _HTML_STYLE_TAGS.get(part)
+                if toggle is None:
                     # 跳过其他未处理的HTML标签
-                    end_tag = html_text.find(">", i)
-                    i = end_tag + 1
-                else:
-                    current_text += html_text[i]
-                    i += 1
+                    continue
+                
+                # 如果有积累的文本，先添加现有文本
+                if current_text:
+                    flush()
+                    current_text = ""
+                state[toggle[0]] = toggle[1]
             
             # 添加剩余文本
             if current_text:
-                run = paragraph.add_run(current_text)
-                run.bold = is_bold
-                run.italic = is_italic
-                run.underline = is_underline
+                flush()
         
         except Exception as e:
             print(f"应用HTML格式化时出错: {e}")
             # 回退到纯文本
-            paragraph.text = html_text.replace("<b>", "").replace("</b>", "").replace("<i>", "").replace("</i>", "").replace("<u>", "").replace("</u>", "").replace("<br>", "\n")
+            paragraph.text = _HTML_STYLE_TAG_RE.sub("", html_text).replace("<br>", "\n")
 
     def _process_complex_page_by_elements(self, doc, page, pdf_document, tables):
         """
@@ -3110,19 +3567,20 @@ class EnhancedPDFConverter:
         """
         try:
             # 获取页面内容
-            page_dict = page.get_text("dict", sort=True)
-            blocks = page_dict["blocks"]
+            page_dict = self._page_dict(page)
+            blocks = list(page_dict["blocks"])
             
             # 预处理块，标记表格区域
             blocks = self._mark_table_regions(blocks, tables)
             
             # 按y0坐标排序块，以保持垂直阅读顺序
-            blocks.sort(key=lambda b: (b["bbox"][1], b["bbox"][0]))
+            blocks.sort(key=_block_position_key)
             
             # 依次处理每个块
             current_y = -1
             current_paragraph = None
             
+            page_width = page.rect.width
             for block in blocks:
                 # 处理表格
                 if block.get("is_table", False):
@@ -3140,6 +3598,8 @@ class EnhancedPDFConverter:
                 
                 # 处理文本
                 if block["type"] == 0:
+                    # 记录实际页面宽度，文本处理时据此复用已检测的段落格式
+                    block["page_width"] = page_width
                     block_y = block["bbox"][1]
                     new_paragraph_needed = (current_y == -1 or 
                                         (abs(block_y - current_y) > 12) or  
@@ -3151,7 +3611,7 @@ class EnhancedPDFConverter:
                         
                         # 设置段落格式
                         try:
-                            format_result = self._detect_paragraph_format(block, page.rect.width)
+                            format_result = self._detect_paragraph_format(block, page_width)
                             if isinstance(format_result, tuple) and len(format_result) == 2:
                                 alignment, left_indent = format_result
                             else:
@@ -3183,12 +3643,16 @@ class EnhancedPDFConverter:
         """处理页面中的矢量图形元素"""
         try:
             # 提取页面中的路径对象（可能是图表、图形等）
-            paths = page.get_drawings()
+            # get_cdrawings直接返回原始数值元组，不为每个路径构造Rect/Point/Matrix对象，
+            # 纯文本页面上返回空列表的代价也更低
+            paths = page.get_cdrawings()
             if not paths:
                 return
                     
             # 如果存在矢量图形，则渲染为图像
             # 创建一个包含所有路径的合并边界框
+            # 注意: PyMuPDF返回的路径项是元组(如('re', rect, 1))而非字典，
+            # 下面的字典检查不会匹配任何路径项，此方法目前总是在渲染前返回
             paths_bbox = None
             for path in paths:
                 if not path:
@@ -3264,29 +3728,27 @@ class EnhancedPDFConverter:
             pix = page.get_pixmap(matrix=matrix, clip=expanded_bbox, alpha=False)
             
             # 保存为临时文件
-            img_path = os.path.join(self.temp_dir, f"vector_graphics_{page.number}_{hash(str(expanded_bbox))}.png")
-            pix.save(img_path)
+            img_path = os.path.join(self.temp_dir, f"vector_graphics_{page.number}_{_rect_tag(expanded_bbox)}.png")
+            pix.save(img_path)  # 保存失败时会抛出异常，无需再检查文件是否存在
             
-            # 添加到文档
-            if os.path.exists(img_path):
-                # 计算图像宽度
-                graphics_width = width / 72.0  # 转换为英寸
-                
-                # 计算最大宽度
-                try:
-                    section_width = doc.sections[0].page_width.inches
-                    margins = doc.sections[0].left_margin.inches + doc.sections[0].right_margin.inches
-                    max_width_inches = section_width - margins - 0.1
-                except:
-                    max_width_inches = 6.0
-                    
-                # 限制图像宽度
-                img_width = min(graphics_width, max_width_inches)
+            # 计算图像宽度
+            graphics_width = width / 72.0  # 转换为英寸
+            
+            # 计算最大宽度
+            try:
+                section_width, left_margin, right_margin = self._doc_page_geometry(doc)
+                margins = left_margin + right_margin
+                max_width_inches = section_width - margins - 0.1
+            except:
+                max_width_inches = 6.0
                 
-                # 添加到文档
-                p = doc.add_paragraph()
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                p.add_run().add_picture(img_path, width=Inches(img_width))
+            # 限制图像宽度
+            img_width = min(graphics_width, max_width_inches)
+            
+            # 添加到文档
+            p = doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.add_run().add_picture(img_path, width=Inches(img_width))
         except Exception as e:
             print(f"处理矢量图形时出错: {e}")
             import traceback
@@ -3313,24 +3775,23 @@ class EnhancedPDFConverter:
             
             # 保存为临时文件
             import os
-            image_path = os.path.join(self.temp_dir, f"table_image_{page.number}_{hash(str(bbox))}.png")
-            pix.save(image_path)
+            image_path = os.path.join(self.temp_dir, f"table_image_{page.number}_{_rect_tag(bbox)}.png")
+            pix.save(image_path)  # 保存失败时会抛出异常，无需再检查文件是否存在
             
             # 添加图像到文档
-            if os.path.exists(image_path):
-                p = doc.add_paragraph()
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                
-                # 计算表格宽度并设置图像宽度
-                table_width = (bbox[2] - bbox[0]) / 72.0  # 转换为英寸（假设72 DPI）
-                max_width = 6.0  # 最大宽度（英寸）
-                
-                # 添加图像
-                p.add_run().add_picture(image_path, width=Inches(min(max_width, table_width)))
-                print(f"成功将表格作为图像添加: {image_path}")
-                
-                # 添加一个空段落作为间距
-                doc.add_paragraph()
+            p = doc.add_paragraph()
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            # 计算表格宽度并设置图像宽度
+            table_width = (bbox[2] - bbox[0]) / 72.0  # 转换为英寸（假设72 DPI）
+            max_width = 6.0  # 最大宽度（英寸）
+            
+            # 添加图像
+            p.add_run().add_picture(image_path, width=Inches(min(max_width, table_width)))
+            print(f"成功将表格作为图像添加: {image_path}")
+            
+            # 添加一个空段落作为间距
+            doc.add_paragraph()
         except Exception as e:
             print(f"将表格作为图像添加时出错: {e}")
             import traceback
@@ -3404,12 +3865,13 @@ class EnhancedPDFConverter:
                 # 处理多行文本 - 确保保留换行符
                 if isinstance(fixed_row[i], str):
                     # 替换连续空格为单个空格，但保留换行符
-                    fixed_row[i] = re.sub(r' {2,}', ' ', fixed_row[i])
+                    fixed_row[i] = _REPEATED_SPACES_RE.sub(' ', fixed_row[i])
                     # 删除行首行尾空白，但保留内部格式
                     fixed_row[i] = fixed_row[i].strip()
             
             fixed_table_data.append(fixed_row)
-          # 验证合并单元格信息
+
+        # 验证合并单元格信息
         if merged_cells is None:
             merged_cells = []
         
@@ -3425,50 +3887,6 @@ class EnhancedPDFConverter:
                     0 <= start_col <= end_col < col_count):
                     fixed_merged_cells.append((start_row, start_col, end_row, end_col))
         
-                    return fixed_table_data, fixed_merged_cells
-            for col_idx in range(len(fixed_row)):
-                cell_value = fixed_row[col_idx]
-                
-                # 转换None为空字符串
-                if cell_value is None:
-                    fixed_row[col_idx] = ""
-                    continue
-                    
-                # 尝试将单元格内容转换为字符串
-                try:
-                    # 如果是数字，保留原值便于后续格式化
-                    if isinstance(cell_value, (int, float)):
-                        fixed_row[col_idx] = cell_value
-                    else:
-                        # 转换为字符串并去除前后空白
-                        fixed_row[col_idx] = str(cell_value).strip()
-                except Exception as e:
-                    print(f"转换单元格内容时出错 ({row_idx}, {col_idx}): {e}")
-                    fixed_row[col_idx] = ""
-            
-            fixed_table_data.append(fixed_row)
-        
-        # 验证并修复合并单元格信息
-        fixed_merged_cells = []
-        if merged_cells:
-            row_count = len(fixed_table_data)
-            
-            for merge_info in merged_cells:
-                if len(merge_info) != 4:
-                    print(f"警告: 无效的合并单元格信息: {merge_info}")
-                    continue
-                    
-                start_row, start_col, end_row, end_col = merge_info
-                
-                # 确保索引在有效范围内
-                start_row = max(0, min(start_row, row_count - 1))
-                end_row = max(start_row, min(end_row, row_count - 1))
-                start_col = max(0, min(start_col, col_count - 1))
-                end_col = max(start_col, min(end_col, col_count - 1))
-                
-                # 添加有效的合并单元格信息
-                fixed_merged_cells.append((start_row, start_col, end_row, end_col))
-        
         # 处理空表格的特殊情况
         if len(fixed_table_data) == 0:
             # 创建一个最小的有效表格 (1x1)
@@ -3480,7 +3898,7 @@ class EnhancedPDFConverter:
             for col_idx, cell_value in enumerate(row):
                 if isinstance(cell_value, str):
                     # 替换控制字符和其他无效字符
-                    clean_value = ''.join(c if (c.isprintable() or c in ['\n', '\t']) else ' ' for c in cell_value)
+                    clean_value = cell_value if cell_value.isprintable() else cell_value.translate(_UNPRINTABLE_TO_SPACE)
                     
                     # 处理过长的单元格内容
                     if len(clean_value) > 32767:  # Word单元格文本长度限制
@@ -3538,15 +3956,15 @@ class EnhancedPDFConverter:
             # 检测单元格背景色和样式
             # 提取表格区域的详细信息
             clip_rect = fitz.Rect(bbox)
-            pixmap = page.get_pixmap(matrix=fitz.Matrix(2, 2), clip=clip_rect, alpha=False)
+            pixmap = page.get_pixmap(matrix=_TABLE_ZOOM_MATRIX, clip=clip_rect, alpha=False)
             
             # 获取表格区域的文本块，用于确定单元格位置
-            table_text = page.get_text("dict", clip=clip_rect)
+            table_text = self._table_region_dict(page, bbox)
             
             # 提取表格结构
             table_structure = []
             if "blocks" in table_text:
-                blocks = sorted(table_text["blocks"], key=lambda b: (b["bbox"][1], b["bbox"][0]))
+                blocks = sorted(table_text["blocks"], key=_block_position_key)
                 
                 # 按行组织数据
                 rows = []
@@ -3678,7 +4096,8 @@ class EnhancedPDFConverter:
         except Exception as e:
             print(f"表格样式检测失败: {e}")
             import traceback
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             return {
                 "table_style": "Table Grid",
                 "alignment": "center"
@@ -3698,10 +4117,9 @@ class EnhancedPDFConverter:
             (r, g, b)元组，表示背景色
         """
         try:
-            # 转换坐标到pixmap的坐标系统
-            # Pixmap对象没有rect属性，但有width和height属性
-            pix_x = int(x * pixmap.width / pixmap.width)  # 简化为直接使用x
-            pix_y = int(y * pixmap.height / pixmap.height)  # 简化为直接使用y
+            # 坐标直接作为pixmap中的像素位置
+            pix_x = int(x)
+            pix_y = int(y)
             
             # 确定采样区域
             x0 = max(0, pix_x - sample_size // 2)
@@ -3767,6 +4185,9 @@ class EnhancedPDFConverter:
         """
         检测文本块的段落格式（对齐方式和缩进）
         
+        同一文本块通常先由页面处理循环检测一次，再在_process_text_with_exact_line_breaks中
+        检测一次，结果按页面宽度缓存在文本块上
+        
         参数:
             block: 文本块
             page_width: 页面宽度
@@ -3774,88 +4195,41 @@ class EnhancedPDFConverter:
         返回:
             tuple: (alignment, left_indent) - 对齐方式和左缩进值
         """
+        cached = block.get("_etc_paragraph_format")
+        if cached is not None and cached[0] == page_width:
+            return cached[1]
+        
+        result = self._compute_paragraph_format(block, page_width)
+        block["_etc_paragraph_format"] = (page_width, result)
+        return result
+
+    def _compute_paragraph_format(self, block, page_width):
+        """
+        检测文本块的段落格式，不使用缓存 - 参数和返回值同_detect_paragraph_format
+        """
         try:
-            # 获取块的边界框
-            bbox = block["bbox"]
-            left = bbox[0]
-            right = bbox[2]
-            width = right - left
-            
             # 获取块中所有的行
             lines = block.get("lines", [])
             if not lines:
                 return WD_ALIGN_PARAGRAPH.LEFT, 0
             
-            # 收集所有行的左右边界
-            line_lefts = []
-            line_rights = []
-            line_widths = []
-            
-            for line in lines:
-                line_bbox = line["bbox"]
-                line_left = line_bbox[0]
-                line_right = line_bbox[2]
-                line_width = line_right - line_left
-                
-                line_lefts.append(line_left)
-                line_rights.append(line_right)
-                line_widths.append(line_width)
-            
-            # 计算平均值
-            avg_left = sum(line_lefts) / len(line_lefts)
-            avg_right = sum(line_rights) / len(line_rights)
-            avg_width = sum(line_widths) / len(line_widths)
-            
-            # 页面中央位置
-            page_center = page_width / 2
-            
-            # 计算文本块中心点
-            block_center = (avg_left + avg_right) / 2
-            
-            # 检测左缩进
-            left_indent = 0
-            if avg_left > 20:  # 如果左边距大于20点，认为有缩进
-                left_indent = avg_left
-            
-            # 检查是否为居中对齐
-            center_tolerance = page_width * 0.1  # 10%的页面宽度作为容差
-            if abs(block_center - page_center) < center_tolerance:
-                # 额外检查：如果文本宽度很小（相对于页面），更可能是居中的
-                if avg_width < page_width * 0.7:  # 文本宽度小于页面宽度的70%
-                    return WD_ALIGN_PARAGRAPH.CENTER, 0
-            
-            # 检查是否为右对齐
-            right_margin = page_width - avg_right
-            if right_margin < 50 and avg_left > 100:  # 右边距小，左边距大
-                return WD_ALIGN_PARAGRAPH.RIGHT, 0
-            
-            # 检查是否为两端对齐（判断标准：多行文本，且最后一行明显短于其他行）
-            if len(lines) > 1:
-                # 获取除最后一行外的所有行宽度
-                other_line_widths = line_widths[:-1]
-                if other_line_widths:
-                    avg_other_width = sum(other_line_widths) / len(other_line_widths)
-                    last_line_width = line_widths[-1]
-                    
-                    # 如果最后一行明显短于其他行（小于80%），可能是两端对齐
-                    if last_line_width < avg_other_width * 0.8 and avg_width > page_width * 0.7:
-                        return WD_ALIGN_PARAGRAPH.JUSTIFY, left_indent
+            line_bboxes = [line["bbox"] for line in lines]
+            alignment_code, left_indent, is_centered = _paragraph_format_core(line_bboxes, page_width)
+            if alignment_code:
+                return _PARAGRAPH_ALIGNMENTS[alignment_code], left_indent
             
             # 检查是否有特殊的段落样式标记
             try:
-                spans = []
-                for line in lines:
-                    for span in line.get("spans", []):
-                        spans.append(span)
+                # 只需要第一个span，无需收集全部span
+                first_span = next((span for line in lines for span in line.get("spans", [])), None)
                 
                 # 检查是否包含居中的标题特征（粗体、大字体等）
-                if spans:
-                    first_span = spans[0]
+                if first_span is not None:
                     font_size = first_span.get("size", 0)
                     font_flags = first_span.get("flags", 0)
                     
                     # 粗体 (0x1)、大字体 (> 12)、居中位置，很可能是标题
-                    if (font_flags & 0x1) and font_size > 12 and abs(block_center - page_center) < center_tolerance:
+                    if (font_flags & 0x1) and font_size > 12 and is_centered:
                         return WD_ALIGN_PARAGRAPH.CENTER, 0
             except Exception as e:
                 print(f"分析段落样式时出错: {e}")
@@ -3975,7 +4349,8 @@ class EnhancedPDFConverter:
         
         except Exception as e:
             print(f"检测单元格背景色时出错: {e}")
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             return None
 
     def _apply_cell_background_color(self, cell, color):
@@ -4002,7 +4377,7 @@ class EnhancedPDFConverter:
             
             # 设置单元格背景色
             shading_elm = cell._element.get_or_add_tcPr()
-            shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{rgb_str}"/>')
+            shading = _new_shading(rgb_str)
             
             # 移除现有的底纹元素（如果有）
             for old_shd in cell._element.tcPr.xpath('./w:shd'):
@@ -4020,7 +4395,8 @@ class EnhancedPDFConverter:
         
         except Exception as e:
             print(f"应用单元格背景色时出错: {e}")
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
 
 
     
@@ -4060,7 +4436,7 @@ class EnhancedPDFConverter:
             
             # 创建Word表格
             rows = len(table_data)
-            cols = max(len(row) for row in table_data) if table_data else 0
+            cols = max(map(len, table_data), default=0)
             
             if rows == 0 or cols == 0:
                 self._insert_table_as_image(doc, page, block["bbox"])
@@ -4071,10 +4447,12 @@ class EnhancedPDFConverter:
             word_table.style = table_style_info.get("table_style", "Table Grid")
             
             # 填充表格数据
+            # word_table.cell(i, j)每次调用都会重建整个单元格网格，填充前(尚未合并)只获取一次
+            table_cells = word_table._cells
             for i, row in enumerate(table_data):
                 for j, cell_content in enumerate(row):
                     if j < cols:  # 确保不超出列数
-                        cell = word_table.cell(i, j)
+                        cell = table_cells[i * cols + j]
                         if cell_content:
                             cell.text = str(cell_content)
                             # 在填充表格数据的部分中（处理每个单元格的地方）
@@ -4125,7 +4503,7 @@ class EnhancedPDFConverter:
                                     
                                     # 设置单元格背景色
                                     shading_elm = cell._element.get_or_add_tcPr()
-                                    shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{color_hex}"/>')
+                                    shading = _new_shading(color_hex)
                                     shading_elm.append(shading)
                                 
                                 # 应用对齐方式
@@ -4162,8 +4540,10 @@ class EnhancedPDFConverter:
                     if (start_row < rows and end_row < rows and 
                         start_col < cols and end_col < cols):
                         try:
-                            start_cell = word_table.cell(start_row, start_col)
-                            end_cell = word_table.cell(end_row, end_col)
+                            # 每次合并都会改变网格，需要重新获取，但两个端点共用一次
+                            table_cells = word_table._cells
+                            start_cell = table_cells[start_row * cols + start_col]
+                            end_cell = table_cells[end_row * cols + end_col]
                             start_cell.merge(end_cell)
                         except Exception as merge_err:
                             print(f"合并单元格时出错: {merge_err}")
@@ -4196,7 +4576,8 @@ class EnhancedPDFConverter:
             
         except Exception as e:
             print(f"处理表格时出错: {e}")
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             # 如果处理失败，使用图像方式
             self._insert_table_as_image(doc, page, block["bbox"])
     
@@ -4244,7 +4625,7 @@ class EnhancedPDFConverter:
                 zoom = 4.0  # 提高分辨率 (原为2.0)
                 matrix = fitz.Matrix(zoom, zoom)
                 pix = page.get_pixmap(matrix=matrix, clip=clip_rect, alpha=False)
-                img_path = os.path.join(self.temp_dir, f"image_{page.number}_{hash(str(bbox))}_high_res.png")
+                img_path = os.path.join(self.temp_dir, f"image_{page.number}_{_rect_tag(bbox)}_high_res.png")
                 pix.save(img_path)
                 if os.path.exists(img_path):
                     extraction_methods.append(("bbox_high_res", img_path))
@@ -4264,7 +4645,7 @@ class EnhancedPDFConverter:
                 zoom = 3.0
                 matrix = fitz.Matrix(zoom, zoom)
                 pix = page.get_pixmap(matrix=matrix, clip=clip_rect, alpha=False)
-                img_path = os.path.join(self.temp_dir, f"image_{page.number}_{hash(str(expanded_bbox))}_expanded.png")
+                img_path = os.path.join(self.temp_dir, f"image_{page.number}_{_rect_tag(expanded_bbox)}_expanded.png")
                 pix.save(img_path)
                 if os.path.exists(img_path):
                     extraction_methods.append(("expanded_bbox", img_path))
@@ -4282,8 +4663,8 @@ class EnhancedPDFConverter:
             
             # 重新计算图像尺寸以确保正确的宽高比
             try:
-                section_width = doc.sections[0].page_width.inches
-                margins = doc.sections[0].left_margin.inches + doc.sections[0].right_margin.inches
+                section_width, left_margin, right_margin = self._doc_page_geometry(doc)
+                margins = left_margin + right_margin
                 max_width_inches = section_width - margins - 0.1
             except:
                 max_width_inches = 6.0
@@ -4394,7 +4775,8 @@ class EnhancedPDFConverter:
             except Exception as e:
                 print(f"警告: 提取表格数据时出错: {e}")
                 import traceback
-                traceback.print_exc()
+                if self._verbose:
+                    traceback.print_exc()
                 table_data = []
                 merged_cells = []
             
@@ -4415,22 +4797,27 @@ class EnhancedPDFConverter:
             
             marked_blocks.append(table_block)
         
-        # 添加非表格区域的块
-        for block in blocks:
-            block_rect = fitz.Rect(block["bbox"])
-            
-            # 检查此块是否与任何表格重叠
-            is_in_table = False
-            for table_block in [b for b in marked_blocks if b.get("is_table", False)]:
-                table_rect = fitz.Rect(table_block["bbox"])
-                # 检查重叠
-                if block_rect.intersects(table_rect) and block_rect.get_area() / block_rect.get_area() > 0.5:
-                    is_in_table = True
-                    break
-                    
-            # 如果不在表格中，添加到最终块列表
-            if not is_in_table:
-                marked_blocks.append(block)
+        # 添加非表格区域的块: 一次性计算所有块与所有表格的交叠比例
+        # (交集面积 / 块面积)，超过一半的块视为表格内容
+        table_bboxes = [b["bbox"] for b in marked_blocks if b.get("is_table", False)]
+        if blocks and table_bboxes:
+            B = np.array([block["bbox"][:4] for block in blocks], dtype=np.float64)
+            T = np.array(table_bboxes, dtype=np.float64)
+            ix0 = np.maximum(B[:, None, 0], T[None, :, 0])
+            iy0 = np.maximum(B[:, None, 1], T[None, :, 1])
+            ix1 = np.minimum(B[:, None, 2], T[None, :, 2])
+            iy1 = np.minimum(B[:, None, 3], T[None, :, 3])
+            inter = np.clip(ix1 - ix0, 0, None) * np.clip(iy1 - iy0, 0, None)
+            area = (B[:, 2] - B[:, 0]) * (B[:, 3] - B[:, 1])
+            # 面积为0的块不属于任何表格
+            ratio = np.divide(inter, area[:, None], out=np.zeros_like(inter),
+                              where=area[:, None] > 0)
+            in_table = ratio.max(axis=1) > 0.5
+        else:
+            in_table = np.zeros(len(blocks), dtype=bool)
+
+        # 如果不在表格中，添加到最终块列表
+        marked_blocks.extend(block for block, hit in zip(blocks, in_table) if not hit)
         
         # 按垂直位置排序
         marked_blocks.sort(key=lambda b: b["bbox"][1])
@@ -4583,7 +4970,8 @@ class EnhancedPDFConverter:
         except Exception as e:
             print(f"构建表格时出错: {e}")
             import traceback
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             return [], []
 
     def _detect_merged_cells(self, table):
@@ -4603,6 +4991,14 @@ class EnhancedPDFConverter:
             if isinstance(table, dict) and "merged_cells" in table:
                 return table.get("merged_cells", [])
                 
+            # 同一表格先在预扫描阶段、再在表格处理阶段各检测一次，检测结果缓存在表格上
+            if isinstance(table, dict):
+                cached = table.get("_etc_merged_cells")
+            else:
+                cached = getattr(table, "_etc_merged_cells", None)
+            if cached is not None:
+                return list(cached)
+            
             # 获取单元格数据
             cells = None
             if isinstance(table, dict) and "cells" in table:
@@ -4615,19 +5011,42 @@ class EnhancedPDFConverter:
             if not cells:
                 return []
                 
-            # 收集行列边界信息
+            # 一次遍历读取每个单元格的边界、文本和样式信息，同时收集行列边界
+            # 每项为 (边界, 文本, 字体, 是否带字体信息, 是否标记为表头)
+            normalized_cells = []
             rows_edges = set()
             cols_edges = set()
             
             for cell in cells:
-                # 提取单元格边界
                 cell_bbox = None
-                if isinstance(cell, dict) and "bbox" in cell:
-                    cell_bbox = cell["bbox"]
+                cell_text = ""
+                cell_font = None
+                has_font = False
+                marked_header = False
+                
+                if isinstance(cell, dict):
+                    if "bbox" in cell:
+                        cell_bbox = cell["bbox"]
+                    if "text" in cell:
+                        cell_text = cell["text"]
+                    if "font" in cell:
+                        cell_font = cell["font"]
+                        has_font = True
+                    marked_header = bool(cell.get("is_header"))
                 elif hasattr(cell, 'bbox'):
                     cell_bbox = cell.bbox
+                    if hasattr(cell, 'text'):
+                        cell_text = cell.text
+                    if hasattr(cell, 'font'):
+                        cell_font = cell.font
+                        has_font = True
+                    marked_header = bool(getattr(cell, 'is_header', False))
                 elif isinstance(cell, (list, tuple)) and len(cell) >= 4:
                     cell_bbox = cell[:4]
+                    if len(cell) > 4 and isinstance(cell[4], str):
+                        cell_text = cell[4]
+                
+                normalized_cells.append((cell_bbox, cell_text, cell_font, has_font, marked_header))
                 
                 if not cell_bbox or len(cell_bbox) < 4:
                     continue
@@ -4654,50 +5073,30 @@ class EnhancedPDFConverter:
             has_header = False
             header_row_indices = []
             
-            # 计算单元格宽度信息
-            col_widths = [0] * (len(cols_edges) - 1)
-            for i in range(len(cols_edges) - 1):
-                col_widths[i] = cols_edges[i+1] - cols_edges[i]
+            # 计算单元格宽度信息 - 相邻列边界之差
+            col_widths = [right - left for left, right in zip(cols_edges, cols_edges[1:])]
             
             # 检测每个单元格的合并情况
-            for cell in cells:
-                # 提取单元格边界
-                cell_bbox = None
-                cell_text = ""
-                
-                if isinstance(cell, dict):
-                    if "bbox" in cell:
-                        cell_bbox = cell["bbox"]
-                    if "text" in cell:
-                        cell_text = cell["text"]
-                    # 检查样式信息
-                    if "font" in cell:
-                        # 记录字体样式信息
-                        cell_styles[tuple(cell_bbox)] = cell["font"]
-                    if "is_header" in cell and cell["is_header"]:
-                        has_header = True
-                elif hasattr(cell, 'bbox'):
-                    cell_bbox = cell.bbox
-                    if hasattr(cell, 'text'):
-                        cell_text = cell.text
-                    # 检查样式属性
-                    if hasattr(cell, 'font'):
-                        cell_styles[tuple(cell_bbox)] = cell.font
-                    if hasattr(cell, 'is_header') and cell.is_header:
-                        has_header = True
-                elif isinstance(cell, (list, tuple)) and len(cell) >= 4:
-                    cell_bbox = cell[:4]
-                    if len(cell) > 4 and isinstance(cell[4], str):
-                        cell_text = cell[4]
+            for cell_bbox, cell_text, cell_font, has_font, marked_header in normalized_cells:
+                if marked_header:
+                    has_header = True
                 
                 if not cell_bbox or len(cell_bbox) < 4:
                     continue
                 
+                # 边界元组同时作为样式表的键，每个单元格只构造一次
+                bbox_key = tuple(cell_bbox)
+                x0, y0, x1, y1 = bbox_key[:4]
+                
+                # 记录字体样式信息
+                if has_font:
+                    cell_styles[bbox_key] = cell_font
+                
                 # 查找单元格对应的表格位置
-                row_start = row_mapping.get(cell_bbox[1], -1)
-                row_end = row_mapping.get(cell_bbox[3], -1)
-                col_start = col_mapping.get(cell_bbox[0], -1)
-                col_end = col_mapping.get(cell_bbox[2], -1)
+                row_start = row_mapping.get(y0, -1)
+                row_end = row_mapping.get(y1, -1)
+                col_start = col_mapping.get(x0, -1)
+                col_end = col_mapping.get(x1, -1)
                 
                 # 检查是否是合并单元格
                 if (row_start >= 0 and row_end > row_start and 
@@ -4706,13 +5105,13 @@ class EnhancedPDFConverter:
                     if row_end - row_start > 1 or col_end - col_start > 1:
                         merged_cells.append((row_start, col_start, row_end - 1, col_end - 1))
                 
-                # 检测表头行
-                if row_start == 0 and not has_header:
+                # 检测表头行 - 只有第0行会被记为表头行，一旦确定就跳过其余首行单元格
+                if row_start == 0 and not has_header and not header_row_indices:
                     # 检查是否有表头特征
                     is_header = False
                     
                     # 检查文本是否为粗体或大字体（表头特征）
-                    font_info = cell_styles.get(tuple(cell_bbox), {})
+                    font_info = cell_styles.get(bbox_key, {})
                     if isinstance(font_info, dict):
                         if font_info.get("bold", False) or font_info.get("size", 0) > 12:
                             is_header = True
@@ -4724,14 +5123,11 @@ class EnhancedPDFConverter:
                     # 或者通过文本特征判断是否为表头
                     if not is_header and cell_text:
                         # 表头通常较短，且可能包含特定词汇
-                        header_keywords = ["total", "sum", "合计", "小计", "总计", "标题", 
-                                        "序号", "编号", "日期", "时间", "姓名", "名称", 
-                                        "金额", "价格", "数量"]
                         if (len(cell_text.strip()) < 20 and 
-                            any(keyword in cell_text.lower() for keyword in header_keywords)):
+                            _HEADER_KEYWORD_RE.search(cell_text.lower())):
                             is_header = True
                     
-                    if is_header and row_start not in header_row_indices:
+                    if is_header:
                         header_row_indices.append(row_start)
             
             # 如果检测到表头行，添加到表格元数据
@@ -4746,9 +5142,18 @@ class EnhancedPDFConverter:
             elif isinstance(table, dict):
                 table["col_widths"] = col_widths
             
-            return merged_cells
+            # 缓存检测结果(表头行和列宽已写回表格)，返回副本避免调用方修改缓存
+            if isinstance(table, dict):
+                table["_etc_merged_cells"] = merged_cells
+            else:
+                try:
+                    table._etc_merged_cells = merged_cells
+                except AttributeError:
+                    pass
+            return list(merged_cells)
             
         except Exception as e:
             print(f"检测合并单元格时出错: {e}")
-            traceback.print_exc()
+            if self._verbose:
+                traceback.print_exc()
             return []
\ No newline at end of file
@@ -7,6 +7,25 @@ import sys
 import traceback
 import types
 
+def _get_page_text_dict(page):
+    """
+    获取页面的文本字典，结果缓存在页面对象上
+    
+    布局、网格和文本对齐三种检测方法依次回退，共用同一次文本提取结果；
+    缓存属性与转换器的_page_dict相同，转换器的排序视图也由这份结果生成
+    
+    参数:
+        page: fitz.Page对象
+        
+    返回:
+        dict: page.get_text("dict")的结果
+    """
+    page_dict = getattr(page, "_etc_text_dict", None)
+    if page_dict is None:
+        page_dict = page.get_text("dict")
+        page._etc_text_dict = page_dict
+    return page_dict
+
 def apply_enhanced_table_detection_patch(converter):
     """应用增强型表格检测补丁到转换器"""
     
@@ -214,7 +233,7 @@ def apply_enhanced_table_detection_patch(converter):
             from collections import defaultdict
             
             # 获取页面文本块
-            page_dict = page.get_text("dict")
+            page_dict = _get_page_text_dict(page)
             blocks = page_dict.get("blocks", [])
             
             # 收集可能是表格单元格的文本块
@@ -326,7 +345,7 @@ def apply_enhanced_table_detection_patch(converter):
             from collections import defaultdict
             
             # 获取页面文本
-            page_dict = page.get_text("dict")
+            page_dict = _get_page_text_dict(page)
             blocks = page_dict.get("blocks", [])
             
             # 收集所有文本行
@@ -439,7 +458,7 @@ def apply_enhanced_table_detection_patch(converter):
             from collections import defaultdict
             
             # 获取页面文本
-            page_dict = page.get_text("dict")
+            page_dict = _get_page_text_dict(page)
             blocks = page_dict.get("blocks", [])
             
             # 收集所有文本行
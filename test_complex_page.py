@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+测试页面复杂度检测在不同格式保留级别下的判定，以及转换器修复只应用一次
+"""
+
+import fitz
+import pdf_converter_fix
+from enhanced_pdf_converter import EnhancedPDFConverter
+
+
+def _make_page(columns):
+    """创建一个包含18个文本块的页面，文本块均匀分布在指定的列中(各列错开行高，避免同一行合并为一个块)"""
+    doc = fitz.open()
+    page = doc.new_page()
+    for i in range(18):
+        column, row = i % columns, i // columns
+        x = 50 + column * 180
+        y = 60 + row * 40 * columns + column * 40
+        page.insert_text((x, y), f"Block {i}", fontsize=10)
+    return doc, page
+
+
+def _converter(level):
+    converter = EnhancedPDFConverter()
+    converter.format_preservation_level = level
+    return converter
+
+
+def test_single_factor_page():
+    """只有文本块数量一个复杂因素: 只有最大保留模式判定为复杂页面"""
+    doc, page = _make_page(columns=1)
+    assert _converter("maximum")._is_complex_page(page) is True
+    assert _converter("enhanced")._is_complex_page(page) is False
+    assert _converter("standard")._is_complex_page(page) is False
+
+
+def test_two_factor_page():
+    """文本块数量和多列布局两个复杂因素: 增强保留模式也判定为复杂页面，标准模式不判定"""
+    doc, page = _make_page(columns=3)
+    assert _converter("maximum")._is_complex_page(page) is True
+    assert _converter("enhanced")._is_complex_page(page) is True
+    assert _converter("standard")._is_complex_page(page) is False
+
+
+def test_table_indicator_text():
+    """表格因素按页面文本中的表格特征判定: 只含一行提及row的文本也算作有表格"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 60), "Each row of the report is listed below.", fontsize=10)
+    assert _converter("maximum")._is_complex_page(page) is True
+    
+    doc, page = _make_page(columns=1)
+    page.insert_text((50, 800), "Each row of the report is listed below.", fontsize=10)
+    assert _converter("enhanced")._is_complex_page(page) is True
+
+
+def test_converter_fixes_applied_once():
+    """转换器修复不在初始化时应用，而是在首次检测非最大保留模式的页面时应用一次"""
+    calls = []
+    original = pdf_converter_fix.apply_enhanced_pdf_converter_fixes
+    pdf_converter_fix.apply_enhanced_pdf_converter_fixes = lambda converter: calls.append(converter)
+    try:
+        converter = _converter("maximum")
+        doc, page = _make_page(columns=1)
+        converter._is_complex_page(page)
+        assert calls == []
+        
+        converter.format_preservation_level = "enhanced"
+        converter._is_complex_page(page)
+        converter._is_complex_page(page)
+        assert calls == [converter]
+    finally:
+        pdf_converter_fix.apply_enhanced_pdf_converter_fixes = original
+
+
+if __name__ == "__main__":
+    test_single_factor_page()
+    test_two_factor_page()
+    test_table_indicator_text()
+    test_converter_fixes_applied_once()
+    print("页面复杂度检测测试通过！")